@@ -4,6 +4,8 @@ Simple launcher for the Trading Signal Web App
 """
 import os
 import sys
+import shutil
+import logging
 from pathlib import Path
 
 # Change to src directory
@@ -20,10 +22,27 @@ print("⏰ First analysis may take 1-2 minutes to load models")
 print("💡 Try companies like: Apple Inc, Tesla Inc, Microsoft Corporation")
 print("-" * 60)
 
-# Import and run the Flask app
+# On Linux, serve with gunicorn: --preload loads the model once in the master and
+# the forked workers share its weights copy-on-write
+gunicorn = shutil.which('gunicorn')
+if sys.platform.startswith('linux') and gunicorn:
+    workers = max(1, (os.cpu_count() or 2) // 2)
+    print(f"🦄 Serving with gunicorn ({workers} workers, preloaded model)")
+    os.environ['PRELOAD_MODELS'] = '1'
+    # Split the cores between the workers so their torch thread pools don't oversubscribe the CPU
+    os.environ.setdefault('OMP_NUM_THREADS', str(max(1, (os.cpu_count() or 1) // workers)))
+    os.execvp(gunicorn, [
+        "gunicorn", "--config", str(src_dir / 'web_app' / 'gunicorn_conf.py'),
+        "-w", str(workers), "--preload",
+        "--timeout", "300",  # a cold analysis can take a couple of minutes
+        "-b", "0.0.0.0:5001", "app:app"
+    ])
+
+# Import and run the Flask app (fallback for Windows/macOS or without gunicorn)
+logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()])
 try:
     from app import app
-    app.run(debug=False, host='0.0.0.0', port=5001, use_reloader=False)
+    app.run(debug=False, host='0.0.0.0', port=5001, use_reloader=False, threaded=True)
 except KeyboardInterrupt:
     print("\n👋 Web app stopped by user")
 except Exception as e:
@@ -4,6 +4,7 @@ from sentiment_analysis.analyzer import SentimentAnalyzer
 from visualization.sentiment_charts import SentimentVisualizer
 import os
 from dotenv import load_dotenv
+import logging
 
 def main():
     """
@@ -98,9 +99,9 @@ def main():
         print(f"  Negative: {summary.get('combined_negative_count', 0)} ({combined_neg:.1f}%)")
         print(f"  Neutral:  {summary.get('combined_neutral_count', 0)} ({combined_neu:.1f}%)")
         
-        # Step 5: Save Data
-        sentiment_filename = f"comprehensive_sentiment_{company_name.replace(' ', '_').lower()}.csv"
-        filepath = news_fetcher.save_to_csv(df_with_sentiment, sentiment_filename)
+        # Step 5: Save Data (Parquet keeps dtypes and reloads much faster than CSV)
+        sentiment_filename = f"comprehensive_sentiment_{company_name.replace(' ', '_').lower()}.parquet"
+        filepath = news_fetcher.save_to_parquet(df_with_sentiment, sentiment_filename)
         
         print(f"\n✅ Data saved to: {filepath}")
         print(f"📊 Charts saved to: data/charts/")
@@ -121,4 +122,5 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
\ No newline at end of file
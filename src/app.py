@@ -1,9 +1,14 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 import os
 import sys
+import logging
 from pathlib import Path
 import json
 import numpy as np
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 
 # Add the current directory to Python path for imports
 current_dir = Path(__file__).parent
@@ -13,32 +18,32 @@ from data_fetcher.news_api import NewsAPIFetcher
 from sentiment_analysis.analyzer import SentimentAnalyzer
 from trading_logic.signal_generator import TradingSignalGenerator
 import pandas as pd
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
-import traceback
 from datetime import datetime
 
 # Load environment variables
 load_dotenv()
 
+# Status lines go through logging so they are formatted lazily and can be silenced with the level;
+# the runner configures the handlers (__main__ below, or run_web_app.py)
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 
-def convert_to_serializable(obj):
-    """
-    Convert numpy/pandas types to JSON serializable types
-    """
-    if isinstance(obj, (np.integer, np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64, np.float32)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_to_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_serializable(item) for item in obj]
-    elif pd.isna(obj):
-        return None
-    return obj
+# Shared pool for the independent per-request analysis steps
+executor = ThreadPoolExecutor(max_workers=4)
+
+# Serialized /analyze responses keyed by (company, max_articles, days_back)
+analysis_cache = TTLCache(maxsize=256, ttl=600)
+analysis_cache_lock = threading.Lock()
+
+# orjson serializes numpy scalars/arrays (and NaN as null) natively in C
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+# Sentiment columns holding float scores produced by the analyzer
+SCORE_COLUMN_SUFFIXES = ('_sentiment_confidence', '_positive_score', '_negative_score')
 
 class TradingAnalysisService:
     """Service class to handle the complete trading analysis pipeline"""
@@ -48,9 +53,42 @@ class TradingAnalysisService:
         self.sentiment_analyzer = None
         self.signal_generator = None
         self.default_company = os.getenv('COMPANY_NAME', 'Apple Inc')
+        self._init_lock = threading.Lock()
     
-    def run_complete_analysis(self, company_name: str = None, max_articles: int = 30, days_back: int = 30):
-        """Run the complete analysis pipeline and return results"""
+    def _ensure_news_fetcher(self):
+        """Create the (lightweight) news fetcher once and reuse it across requests"""
+        if self.news_fetcher is not None:
+            return
+        
+        with self._init_lock:
+            if self.news_fetcher is None:
+                self.news_fetcher = NewsAPIFetcher()
+    
+    def _ensure_components(self):
+        """Load the sentiment model and signal generator once and reuse them across requests"""
+        if self.sentiment_analyzer is not None:
+            return
+        
+        with self._init_lock:
+            # Another request may have finished initialization while we waited
+            if self.sentiment_analyzer is not None:
+                return
+            
+            logger.info("Initializing components...")
+            self.signal_generator = TradingSignalGenerator()
+            
+            sentiment_analyzer = SentimentAnalyzer()
+            # Warm up the model so the first real request doesn't pay allocation costs
+            sentiment_analyzer.warm_up()
+            self.sentiment_analyzer = sentiment_analyzer
+    
+    def run_complete_analysis_iter(self, company_name: str = None, max_articles: int = 30, days_back: int = 30):
+        """
+        Run the complete analysis pipeline, yielding a progress event as each stage starts
+        
+        Yields:
+            dict: {'stage': ...} progress markers, ending with {'stage': 'complete', 'result': ...}
+        """
         try:
             # Use provided company name or default
             if not company_name or company_name.strip() == "":
@@ -58,14 +96,13 @@ class TradingAnalysisService:
             
             company_name = company_name.strip()
             
-            # Step 1: Initialize components
-            print(f"Initializing components for {company_name}...")
-            self.news_fetcher = NewsAPIFetcher()
-            self.sentiment_analyzer = SentimentAnalyzer()
-            self.signal_generator = TradingSignalGenerator()
+            # Step 1: Initialize the news fetcher (models are loaded only once articles are found)
+            yield {'stage': 'initializing', 'company': company_name}
+            self._ensure_news_fetcher()
             
             # Step 2: Fetch news data
-            print(f"Fetching news for {company_name}...")
+            yield {'stage': 'fetching', 'company': company_name}
+            logger.info("Fetching news for %s...", company_name)
             df = self.news_fetcher.fetch_company_news(
                 company_name=company_name,
                 max_articles=max_articles,
@@ -73,39 +110,64 @@ class TradingAnalysisService:
             )
             
             if df.empty:
-                return {
+                yield {'stage': 'complete', 'result': {
                     'success': False,
                     'error': f'No news articles found for "{company_name}". Try a different company name or check spelling.',
                     'signal': 'NO_DATA',
                     'confidence': 0.0,
                     'company': company_name
-                }
+                }}
+                return
             
-            # Step 3: Sentiment Analysis
-            print("Analyzing sentiment...")
-            df_with_sentiment = self.sentiment_analyzer.analyze_dataframe_comprehensive(df)
+            # Step 3: Sentiment Analysis (loaded once, shared by all requests)
+            yield {'stage': 'sentiment', 'articles': int(len(df))}
+            self._ensure_components()
+            logger.info("Analyzing sentiment...")
+            df_with_sentiment = self.sentiment_analyzer.analyze_dataframe_comprehensive(df, copy=False)
+            
+            # Consolidate the frame and store score columns as contiguous float32 arrays
+            # before the signal/summary passes read them
+            df_with_sentiment = df_with_sentiment.copy()
+            for col in df_with_sentiment.columns:
+                if col.endswith(SCORE_COLUMN_SUFFIXES):
+                    df_with_sentiment[col] = np.ascontiguousarray(df_with_sentiment[col].to_numpy(dtype=np.float32))
             
             # Step 4: Generate Trading Signals
-            print("Generating trading signals...")
-            basic_signal = self.signal_generator.generate_basic_signal(df_with_sentiment, 'combined_sentiment_label')
-            weighted_signal = self.signal_generator.generate_weighted_signal(df_with_sentiment, 'combined_sentiment_label')
-            time_weighted_signal = self.signal_generator.generate_time_weighted_signal(df_with_sentiment, 'combined_sentiment_label')
+            yield {'stage': 'signals'}
+            # The signal methods and the summary only read df_with_sentiment, so run them concurrently
+            logger.info("Generating trading signals...")
+            # Count labels once for all three signal methods; the dates are parsed by the time-weighted
+            # signal itself, which falls back to the weighted signal when they are malformed
+            label_counts = df_with_sentiment['combined_sentiment_label'].value_counts()
+            published_dates = df_with_sentiment['published_at'] if 'published_at' in df_with_sentiment.columns else None
+            basic_future = executor.submit(self.signal_generator.generate_basic_signal, df_with_sentiment, 'combined_sentiment_label',
+                                           precomputed_counts=label_counts)
+            weighted_future = executor.submit(self.signal_generator.generate_weighted_signal, df_with_sentiment, 'combined_sentiment_label',
+                                              precomputed_counts=label_counts)
+            time_weighted_future = executor.submit(self.signal_generator.generate_time_weighted_signal, df_with_sentiment, 'combined_sentiment_label',
+                                                   precomputed_counts=label_counts, precomputed_dates=published_dates)
+            summary_future = executor.submit(self.sentiment_analyzer.get_comprehensive_summary, df_with_sentiment)
+            
+            basic_signal = basic_future.result()
+            weighted_signal = weighted_future.result()
+            time_weighted_signal = time_weighted_future.result()
             
             # Determine consensus signal
             signals = [basic_signal['signal'], weighted_signal['signal'], time_weighted_signal['signal']]
+            votes = Counter(signals)
             
-            if signals.count('BUY') >= 2:
+            if votes['BUY'] >= 2:
                 consensus = 'BUY'
-            elif signals.count('SELL') >= 2:
+            elif votes['SELL'] >= 2:
                 consensus = 'SELL'
             else:
                 consensus = 'HOLD'
             
             # Calculate average confidence
-            avg_confidence = (basic_signal['confidence'] + weighted_signal['confidence'] + time_weighted_signal['confidence']) / 3
+            avg_confidence = np.mean([basic_signal['confidence'], weighted_signal['confidence'], time_weighted_signal['confidence']])
             
             # Get sentiment summary
-            sentiment_summary = self.sentiment_analyzer.get_comprehensive_summary(df_with_sentiment)
+            sentiment_summary = summary_future.result()
             
             # Prepare result with explicit type conversion
             result = {
@@ -138,27 +200,45 @@ class TradingAnalysisService:
                 'reasoning': str(weighted_signal.get('reason', 'Signal generated based on sentiment analysis'))
             }
             
-            # Convert any remaining numpy types to JSON serializable types
-            result = convert_to_serializable(result)
-            
-            return result
+            yield {'stage': 'complete', 'result': result}
             
         except Exception as e:
             error_msg = f"Error during analysis: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            logger.exception(error_msg)
             
-            return {
+            yield {'stage': 'complete', 'result': {
                 'success': False,
                 'error': error_msg,
                 'signal': 'ERROR',
                 'confidence': 0.0,
                 'company': company_name if 'company_name' in locals() else 'Unknown'
-            }
+            }}
+    
+    def run_complete_analysis(self, company_name: str = None, max_articles: int = 30, days_back: int = 30):
+        """Run the complete analysis pipeline and return results"""
+        result = None
+        for event in self.run_complete_analysis_iter(company_name, max_articles, days_back):
+            if event['stage'] == 'complete':
+                result = event['result']
+        return result
 
 # Initialize the service
 analysis_service = TradingAnalysisService()
 
+# Under `gunicorn --preload` load the model in the master so forked workers share it copy-on-write
+if os.getenv('PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes'):
+    analysis_service._ensure_components()
+
+def _clamp_search_parameters(max_articles: int, days_back: int):
+    """Fall back to the defaults for out-of-range search parameters"""
+    if max_articles < 5 or max_articles > 100:
+        max_articles = 30
+        
+    if days_back < 1 or days_back > 90:
+        days_back = 30
+    
+    return max_articles, days_back
+
 @app.route('/')
 def index():
     """Main page with the analysis form"""
@@ -183,23 +263,29 @@ def analyze():
                 'confidence': 0.0
             }), 400
         
-        if max_articles < 5 or max_articles > 100:
-            max_articles = 30
-            
-        if days_back < 1 or days_back > 90:
-            days_back = 30
+        max_articles, days_back = _clamp_search_parameters(max_articles, days_back)
+        
+        # Serve repeat queries within the TTL without re-running the pipeline
+        cache_key = (company_name.lower(), max_articles, days_back)
+        with analysis_cache_lock:
+            cached_payload = analysis_cache.get(cache_key)
+        
+        if cached_payload is not None:
+            return Response(cached_payload, mimetype='application/json')
         
         result = analysis_service.run_complete_analysis(company_name, max_articles, days_back)
+        payload = orjson.dumps(result, option=ORJSON_OPTIONS)
         
-        # Ensure the result is JSON serializable
-        result = convert_to_serializable(result)
+        # Only successful analyses are cached so failures are retried
+        if result.get('success'):
+            with analysis_cache_lock:
+                analysis_cache[cache_key] = payload
         
-        return jsonify(result)
+        return Response(payload, mimetype='application/json')
         
     except Exception as e:
         error_msg = f"Error in analysis endpoint: {str(e)}"
-        print(error_msg)
-        traceback.print_exc()
+        logger.exception(error_msg)
         
         return jsonify({
             'success': False,
@@ -208,19 +294,63 @@ def analyze():
             'confidence': 0.0
         }), 500
 
+@app.route('/analyze/stream')
+def analyze_stream():
+    """Run the complete analysis, streaming progress as Server-Sent Events"""
+    company_name = request.args.get('company_name', '').strip()
+    
+    if not company_name:
+        return jsonify({
+            'success': False,
+            'error': 'Please enter a company name',
+            'signal': 'ERROR',
+            'confidence': 0.0
+        }), 400
+    
+    try:
+        max_articles = int(request.args.get('max_articles', 30))
+        days_back = int(request.args.get('days_back', 30))
+    except ValueError:
+        max_articles, days_back = 30, 30
+    
+    max_articles, days_back = _clamp_search_parameters(max_articles, days_back)
+    cache_key = (company_name.lower(), max_articles, days_back)
+    
+    def generate():
+        with analysis_cache_lock:
+            cached_payload = analysis_cache.get(cache_key)
+        
+        if cached_payload is not None:
+            yield b'data: {"stage":"complete","result":' + cached_payload + b'}\n\n'
+            return
+        
+        for event in analysis_service.run_complete_analysis_iter(company_name, max_articles, days_back):
+            if event['stage'] == 'complete' and event['result'].get('success'):
+                with analysis_cache_lock:
+                    analysis_cache[cache_key] = orjson.dumps(event['result'], option=ORJSON_OPTIONS)
+            
+            yield b'data: ' + orjson.dumps(event, option=ORJSON_OPTIONS) + b'\n\n'
+    
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+POPULAR_COMPANIES = (
+    "Apple Inc", "Microsoft Corporation", "Amazon.com Inc", "Alphabet Inc", "Tesla Inc",
+    "Meta Platforms Inc", "NVIDIA Corporation", "Berkshire Hathaway", "JPMorgan Chase",
+    "Johnson & Johnson", "Procter & Gamble", "Visa Inc", "Mastercard Inc", "Coca-Cola",
+    "McDonald's Corporation", "Nike Inc", "Intel Corporation", "IBM", "Oracle Corporation",
+    "Salesforce Inc", "Netflix Inc", "Disney", "Boeing", "General Electric",
+    "Reliance Industries", "Tata Consultancy Services", "Infosys", "HDFC Bank", "ICICI Bank"
+)
+
+@functools.lru_cache(maxsize=1)
+def _suggestions_payload():
+    """Serialize the static suggestions list once"""
+    return json.dumps({'suggestions': list(POPULAR_COMPANIES)})
+
 @app.route('/suggestions')
 def get_company_suggestions():
     """Get popular company suggestions"""
-    popular_companies = [
-        "Apple Inc", "Microsoft Corporation", "Amazon.com Inc", "Alphabet Inc", "Tesla Inc",
-        "Meta Platforms Inc", "NVIDIA Corporation", "Berkshire Hathaway", "JPMorgan Chase",
-        "Johnson & Johnson", "Procter & Gamble", "Visa Inc", "Mastercard Inc", "Coca-Cola",
-        "McDonald's Corporation", "Nike Inc", "Intel Corporation", "IBM", "Oracle Corporation",
-        "Salesforce Inc", "Netflix Inc", "Disney", "Boeing", "General Electric",
-        "Reliance Industries", "Tata Consultancy Services", "Infosys", "HDFC Bank", "ICICI Bank"
-    ]
-    
-    return jsonify({'suggestions': popular_companies})
+    return app.response_class(_suggestions_payload(), mimetype='application/json')
 
 @app.route('/health')
 def health():
@@ -228,13 +358,15 @@ def health():
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()])
+    
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
     os.makedirs('static', exist_ok=True)
     
-    print("🚀 Starting Trading Signal Web App...")
-    print(f"📊 Default Company: {analysis_service.default_company}")
-    print("🌐 Open http://localhost:5001 in your browser")
+    logger.info("🚀 Starting Trading Signal Web App...")
+    logger.info("📊 Default Company: %s", analysis_service.default_company)
+    logger.info("🌐 Open http://localhost:5001 in your browser")
     
     # Disable reloader to prevent the restart issue
     app.run(debug=False, host='0.0.0.0', port=5001, use_reloader=False)
\ No newline at end of file
@@ -1,20 +1,36 @@
 import pandas as pd
 from sentiment_analysis.analyzer import SentimentAnalyzer
-from sentiment_analysis.quick_analyzer import analyze_sentiment
+from sentiment_analysis.quick_analyzer import analyze_sentiment_batch
+from data_fetcher.data_storage import NEWS_DTYPES
 import os
+import logging
+
+def load_news_data(filepath: str) -> pd.DataFrame:
+    """
+    Load news data from a Parquet or CSV file
+    
+    Args:
+        filepath (str): Path to a .parquet or .csv file
+        
+    Returns:
+        pd.DataFrame: Loaded news data
+    """
+    if filepath.endswith('.parquet'):
+        return pd.read_parquet(filepath)
+    return pd.read_csv(filepath, engine='pyarrow', dtype=NEWS_DTYPES)
 
 def apply_sentiment_simple(csv_filepath: str):
     """
-    Apply sentiment analysis to an existing CSV file with news data
+    Apply sentiment analysis to an existing CSV or Parquet file with news data
     
     Args:
-        csv_filepath (str): Path to the CSV file containing news data
+        csv_filepath (str): Path to the CSV/Parquet file containing news data
     """
     print(f"Loading data from: {csv_filepath}")
     
     try:
         # Load the data
-        df = pd.read_csv(csv_filepath)
+        df = load_news_data(csv_filepath)
         print(f"Loaded {len(df)} articles")
         
         # Check required columns
@@ -25,52 +41,68 @@ def apply_sentiment_simple(csv_filepath: str):
         # Initialize sentiment analyzer
         sentiment_analyzer = SentimentAnalyzer()
         
-        print("Applying sentiment analysis to titles...")
+        # Coerce once, column-wise, rather than str() per cell
+        title_text = df['title'].fillna('').astype(str)
+        titles = title_text.tolist()
         
-        # Method 1: Using the quick analyzer function
-        df['title_sentiment'] = df['title'].apply(lambda x: analyze_sentiment(str(x)))
-        
-        # Method 2: Using the comprehensive analyzer for more detailed results
         if 'description' in df.columns:
-            print("Applying sentiment analysis to descriptions...")
-            df['description_sentiment'] = df['description'].apply(lambda x: analyze_sentiment(str(x)))
+            # Title, description and combined texts are independent inputs to the
+            # same model, so score them as one batch and split the labels afterwards
+            print("Applying sentiment analysis to titles, descriptions and combined text...")
+            description_text = df['description'].fillna('').astype(str)
+            df['combined_text'] = title_text.str.cat(description_text, sep=' ')
+            descriptions = description_text.tolist()
+            combined = df['combined_text'].tolist()
             
-            # Combined sentiment
-            print("Analyzing combined title + description sentiment...")
-            df['combined_text'] = df['title'].fillna('') + ' ' + df['description'].fillna('')
-            df['combined_sentiment'] = df['combined_text'].apply(lambda x: analyze_sentiment(str(x)))
+            labels = analyze_sentiment_batch(titles + descriptions + combined)
+            n = len(df)
+            df['title_sentiment'] = labels[:n]
+            df['description_sentiment'] = labels[n:2 * n]
+            df['combined_sentiment'] = labels[2 * n:]
+        else:
+            print("Applying sentiment analysis to titles...")
+            df['title_sentiment'] = analyze_sentiment_batch(titles)
         
         # Show results
         print(f"\n📊 SENTIMENT ANALYSIS RESULTS:")
         print("-" * 50)
         
-        title_sentiment_counts = df['title_sentiment'].value_counts()
-        print("Title Sentiment Distribution:")
-        for sentiment, count in title_sentiment_counts.items():
-            percentage = (count / len(df)) * 100
-            print(f"  {sentiment.capitalize()}: {count} ({percentage:.1f}%)")
+        # Count every sentiment column in one pass
+        sentiment_columns = [col for col in ('title_sentiment', 'description_sentiment', 'combined_sentiment')
+                             if col in df.columns]
+        sentiment_counts = df[sentiment_columns].apply(pd.Series.value_counts).fillna(0).astype(int)
         
-        if 'description_sentiment' in df.columns:
-            print("\nDescription Sentiment Distribution:")
-            desc_sentiment_counts = df['description_sentiment'].value_counts()
-            for sentiment, count in desc_sentiment_counts.items():
+        for i, col in enumerate(sentiment_columns):
+            if i > 0:
+                print()
+            heading = col.replace('_sentiment', '').capitalize()
+            print(f"{heading} Sentiment Distribution:")
+            for sentiment, count in sentiment_counts[col].items():
+                if count == 0:
+                    continue
                 percentage = (count / len(df)) * 100
                 print(f"  {sentiment.capitalize()}: {count} ({percentage:.1f}%)")
         
-        # Save results
-        output_filename = csv_filepath.replace('.csv', '_with_sentiment.csv')
-        df.to_csv(output_filename, index=False)
+        # Save results as Parquet so downstream steps reload them without re-parsing text
+        output_filename = os.path.splitext(csv_filepath)[0] + '_with_sentiment.parquet'
+        df.to_parquet(output_filename, engine='pyarrow', index=False)
         print(f"\n✅ Results saved to: {output_filename}")
         
         # Show sample results
         print(f"\n📰 SAMPLE RESULTS:")
         print("-" * 80)
-        for idx, row in df.head(3).iterrows():
-            print(f"\n{idx + 1}. {row['title']}")
-            print(f"   Title Sentiment: {row['title_sentiment'].upper()}")
-            if 'description_sentiment' in df.columns:
-                print(f"   Description Sentiment: {row['description_sentiment'].upper()}")
-                print(f"   Combined Sentiment: {row['combined_sentiment'].upper()}")
+        if 'description_sentiment' in df.columns:
+            sample = df.head(3)[['title', 'title_sentiment', 'description_sentiment', 'combined_sentiment']]
+            for idx, title, title_s, desc_s, comb_s in sample.itertuples(index=True, name=None):
+                print(f"\n{idx + 1}. {title}")
+                print(f"   Title Sentiment: {title_s.upper()}")
+                print(f"   Description Sentiment: {desc_s.upper()}")
+                print(f"   Combined Sentiment: {comb_s.upper()}")
+        else:
+            sample = df.head(3)[['title', 'title_sentiment']]
+            for idx, title, title_s in sample.itertuples(index=True, name=None):
+                print(f"\n{idx + 1}. {title}")
+                print(f"   Title Sentiment: {title_s.upper()}")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -79,14 +111,14 @@ def main():
     """
     Main function to apply sentiment to existing data
     """
-    # Look for CSV files in the data directory
+    # Look for CSV/Parquet files in the data directory
     data_dir = "data/raw"
     
     if os.path.exists(data_dir):
-        csv_files = [f for f in os.listdir(data_dir) if f.endswith('.csv')]
+        csv_files = [f for f in os.listdir(data_dir) if f.endswith(('.csv', '.parquet'))]
         
         if csv_files:
-            print("Found CSV files:")
+            print("Found data files:")
             for i, file in enumerate(csv_files, 1):
                 print(f"  {i}. {file}")
             
@@ -97,9 +129,10 @@ def main():
             print(f"\nProcessing: {csv_file}")
             apply_sentiment_simple(csv_path)
         else:
-            print("No CSV files found in data/raw directory")
+            print("No CSV or Parquet files found in data/raw directory")
     else:
         print("data/raw directory not found")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
\ No newline at end of file
@@ -1,10 +1,13 @@
 import pandas as pd
+import numpy as np
+from collections import Counter
 from data_fetcher.news_api import NewsAPIFetcher
 from sentiment_analysis.analyzer import SentimentAnalyzer
 from trading_logic.signal_generator import TradingSignalGenerator
 from visualization.sentiment_charts import SentimentVisualizer
 import os
 from dotenv import load_dotenv
+import logging
 
 def main():
     """
@@ -88,15 +91,15 @@ def main():
             print(f"  {method:15}: {signal:20} (Confidence: {confidence:.1%})")
         
         # Consensus signal
-        signal_votes = list(signals_comparison.values())
-        if signal_votes.count('BUY') >= 2:
+        signal_votes = Counter(signals_comparison.values())
+        if signal_votes['BUY'] >= 2:
             consensus = 'BUY'
-        elif signal_votes.count('SELL') >= 2:
+        elif signal_votes['SELL'] >= 2:
             consensus = 'SELL'
         else:
             consensus = 'HOLD'
         
-        consensus_confidence = sum([basic_signal['confidence'], weighted_signal['confidence'], time_weighted_signal['confidence']]) / 3
+        consensus_confidence = np.mean([basic_signal['confidence'], weighted_signal['confidence'], time_weighted_signal['confidence']])
         
         print(f"\n🎯 CONSENSUS SIGNAL: {consensus} (Average Confidence: {consensus_confidence:.1%})")
         
@@ -193,4 +196,5 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
\ No newline at end of file
@@ -1,72 +1,118 @@
 from visualization.sentiment_charts import SentimentVisualizer, create_simple_sentiment_chart
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+import pyarrow.parquet as pq
 import pandas as pd
 import os
+import logging
+
+CHARTS_DIR = Path('data') / 'charts'
+
+# One visualizer per worker process, reused for every file it handles
+_visualizer = None
+
+def _get_visualizer() -> SentimentVisualizer:
+    """Create the worker's SentimentVisualizer on first use"""
+    global _visualizer
+    if _visualizer is None:
+        _visualizer = SentimentVisualizer()
+    return _visualizer
+
+def process_one(csv_path: str) -> List[str]:
+    """
+    Create sentiment charts for a single CSV or Parquet file
+    
+    Args:
+        csv_path (str): Path to a CSV/Parquet file with sentiment columns
+        
+    Returns:
+        list: Paths of the charts that were created
+    """
+    csv_path = Path(csv_path)
+    csv_file = csv_path.name
+    file_stem = csv_path.stem
+    chart_paths = []
+    
+    try:
+        print(f"\n📊 Processing: {csv_file}")
+        
+        # Check what sentiment columns are available from the header/schema alone
+        if csv_path.suffix == '.parquet':
+            all_columns = pq.read_schema(csv_path).names
+        else:
+            all_columns = pd.read_csv(csv_path, nrows=0).columns
+        sentiment_columns = [col for col in all_columns if 'sentiment_label' in col]
+        
+        if not sentiment_columns:
+            print(f"No sentiment columns found in {csv_file}")
+            return chart_paths
+        
+        # Only the label columns are charted, so skip parsing titles/urls/content
+        if csv_path.suffix == '.parquet':
+            df = pd.read_parquet(csv_path, columns=sentiment_columns)
+        else:
+            df = pd.read_csv(csv_path, engine='pyarrow', usecols=sentiment_columns)
+        
+        visualizer = _get_visualizer()
+        
+        # Create charts for each sentiment column found
+        for sentiment_col in sentiment_columns:
+            print(f"Creating chart for: {sentiment_col}")
+            
+            # Generate appropriate title
+            analysis_type = sentiment_col.replace('_sentiment_label', '').replace('_', ' ').title()
+            title = f'{analysis_type} Sentiment Distribution'
+            
+            # Create chart
+            save_path = CHARTS_DIR / f'{file_stem}_{sentiment_col}_chart.png'
+            chart_paths.append(visualizer.create_sentiment_bar_chart(
+                df, sentiment_col, title=title, save_path=str(save_path)
+            ))
+        
+        # If comprehensive data available, create comparison chart
+        if len(sentiment_columns) > 1:
+            comp_save_path = CHARTS_DIR / f'{file_stem}_comprehensive_chart.png'
+            chart_paths.append(visualizer.create_comprehensive_sentiment_chart(df, str(comp_save_path)))
+        
+    except Exception as e:
+        print(f"Error processing {csv_file}: {e}")
+    
+    return chart_paths
 
 def main():
     """
-    Create sentiment visualization charts from existing CSV data
+    Create sentiment visualization charts from existing CSV/Parquet data
     """
-    # Look for CSV files with sentiment data
+    # Look for CSV/Parquet files with sentiment data
     data_dir = "data/raw"
     
     if not os.path.exists(data_dir):
         print("data/raw directory not found")
         return
     
-    csv_files = [f for f in os.listdir(data_dir) if f.endswith('.csv')]
+    csv_files = [f for f in os.listdir(data_dir) if f.endswith(('.csv', '.parquet'))]
     
     if not csv_files:
-        print("No CSV files found in data/raw directory")
+        print("No CSV or Parquet files found in data/raw directory")
         return
     
-    print("Found CSV files:")
+    print("Found data files:")
     for i, file in enumerate(csv_files, 1):
         print(f"  {i}. {file}")
     
-    # Process each CSV file
-    for csv_file in csv_files:
-        csv_path = os.path.join(data_dir, csv_file)
-        
-        try:
-            print(f"\n📊 Processing: {csv_file}")
-            df = pd.read_csv(csv_path)
-            
-            # Check what sentiment columns are available
-            sentiment_columns = [col for col in df.columns if 'sentiment_label' in col]
-            
-            if not sentiment_columns:
-                print(f"No sentiment columns found in {csv_file}")
-                continue
-            
-            visualizer = SentimentVisualizer()
-            
-            # Create charts for each sentiment column found
-            for sentiment_col in sentiment_columns:
-                print(f"Creating chart for: {sentiment_col}")
-                
-                # Generate appropriate title
-                analysis_type = sentiment_col.replace('_sentiment_label', '').replace('_', ' ').title()
-                title = f'{analysis_type} Sentiment Distribution'
-                
-                # Generate save path
-                safe_filename = csv_file.replace('.csv', f'_{sentiment_col}_chart.png')
-                save_path = os.path.join('data', 'charts', safe_filename)
-                
-                # Create chart
-                chart_path = visualizer.create_sentiment_bar_chart(
-                    df, sentiment_col, title=title, save_path=save_path
-                )
-            
-            # If comprehensive data available, create comparison chart
-            if len(sentiment_columns) > 1:
-                comp_save_path = os.path.join('data', 'charts', 
-                                            csv_file.replace('.csv', '_comprehensive_chart.png'))
-                visualizer.create_comprehensive_sentiment_chart(df, comp_save_path)
-            
-        except Exception as e:
-            print(f"Error processing {csv_file}: {e}")
+    # Create the output directory once, up front
+    CHARTS_DIR.mkdir(parents=True, exist_ok=True)
+    
+    # Files are independent, so render them in parallel worker processes
+    csv_paths = [os.path.join(data_dir, csv_file) for csv_file in csv_files]
+    max_workers = min(len(csv_paths), os.cpu_count() or 1)
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(process_one, csv_paths))
     
-    print(f"\n✅ All charts saved to: data/charts/")
+    print(f"\n✅ All charts saved to: {CHARTS_DIR}/")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
\ No newline at end of file
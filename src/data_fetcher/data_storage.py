@@ -1,7 +1,29 @@
+import pandas as pd
+
+# Column types of the article data produced by NewsAPIFetcher
+NEWS_DTYPES = {
+    'title': 'string',
+    'description': 'string',
+    'content': 'string',
+    'url': 'string',
+    'source': 'string',
+    'author': 'string',
+    'url_to_image': 'string',
+    'company_searched': 'string'
+}
+
 class DataStorage:
     def save_to_csv(self, dataframe, filename):
         dataframe.to_csv(filename, index=False)
 
-    def load_from_csv(self, filename):
-        import pandas as pd
-        return pd.read_csv(filename)
\ No newline at end of file
+    def load_from_csv(self, filename, dtype=NEWS_DTYPES, parse_dates=None, chunksize=None):
+        # Text columns default to NEWS_DTYPES so they load as strings; pass dtype=None to infer
+        # With chunksize, pandas returns an iterator of DataFrames instead of loading the whole file
+        return pd.read_csv(filename, dtype=dtype, parse_dates=parse_dates, chunksize=chunksize)
+
+    def save_to_parquet(self, dataframe, filename):
+        # Parquet keeps dtypes (including the published_at timezone) and loads much faster than CSV
+        dataframe.to_parquet(filename, engine='pyarrow', compression='snappy', index=False)
+
+    def load_from_parquet(self, filename, columns=None):
+        return pd.read_parquet(filename, engine='pyarrow', columns=columns)
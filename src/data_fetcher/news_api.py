@@ -1,20 +1,38 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import re
 import pandas as pd
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Upper bound on simultaneous page requests, to stay polite with NewsAPI rate limits
+MAX_CONCURRENT_PAGES = 4
 
 class NewsAPIFetcher:
     """
     A class to fetch news articles from NewsAPI for a specific company
     """
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, max_concurrent_pages=None):
         load_dotenv()
         self.api_key = api_key or os.getenv('API_KEY')
+        # Rate-limit guard for the concurrent page requests (like a semaphore around the pool)
+        self.max_concurrent_pages = max(1, int(max_concurrent_pages or os.getenv('NEWS_MAX_CONCURRENT_PAGES', MAX_CONCURRENT_PAGES)))
         self.base_url = "https://newsapi.org/v2/everything"
         
+        # One keep-alive session for all page requests, with retries on transient server errors
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(8, self.max_concurrent_pages),
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         if not self.api_key:
             raise ValueError("API key is required. Set it in .env file or pass it directly.")
     
@@ -48,54 +66,62 @@ class NewsAPIFetcher:
         }
         
         articles_data = []
-        articles_fetched = 0
         
         try:
-            while articles_fetched < max_articles:
-                print(f"Fetching page {params['page']}...")
-                
-                response = requests.get(self.base_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if data['status'] != 'ok':
-                    print(f"API Error: {data.get('message', 'Unknown error')}")
-                    break
-                
-                articles = data['articles']
+            # Fetch the first page on its own: it tells us how many results exist
+            print(f"Fetching page {params['page']}...")
+            data = self._fetch_page(params)
+            
+            if data['status'] != 'ok':
+                print(f"API Error: {data.get('message', 'Unknown error')}")
+            elif not data['articles']:
+                print("No more articles found.")
+            else:
+                pages = [data]
                 
-                if not articles:
-                    print("No more articles found.")
-                    break
+                # Work out how many further pages are needed and fetch them concurrently
+                total_results = data.get('totalResults', 0)
+                page_size = params['pageSize']
+                if len(data['articles']) == page_size:
+                    wanted = min(max_articles, total_results)
+                    last_page = -(-wanted // page_size)  # ceiling division
+                    
+                    if last_page > 1:
+                        page_params = [dict(params, page=page) for page in range(2, last_page + 1)]
+                        for page_param in page_params:
+                            print(f"Fetching page {page_param['page']}...")
+                        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_pages, len(page_params))) as pool:
+                            futures = [pool.submit(self._fetch_page, page_param) for page_param in page_params]
+                            # Keep the pages that arrived, in order, up to the first failed one
+                            for page_param, future in zip(page_params, futures):
+                                try:
+                                    pages.append(future.result())
+                                except requests.exceptions.RequestException as e:
+                                    print(f"Network error on page {page_param['page']}: {e}")
+                                    break
+                                except Exception as e:
+                                    print(f"Unexpected error on page {page_param['page']}: {e}")
+                                    break
+                            # Later pages are not needed once one has failed
+                            for future in futures:
+                                future.cancel()
                 
-                # Process articles
-                for article in articles:
-                    if articles_fetched >= max_articles:
+                # Process pages in order, stopping at the first error/empty page like a sequential walk
+                for page_data in pages:
+                    if page_data['status'] != 'ok':
+                        print(f"API Error: {page_data.get('message', 'Unknown error')}")
                         break
                     
-                    article_data = {
-                        'title': article.get('title', ''),
-                        'description': article.get('description', ''),
-                        'content': article.get('content', ''),
-                        'url': article.get('url', ''),
-                        'source': article.get('source', {}).get('name', ''),
-                        'author': article.get('author', ''),
-                        'published_at': article.get('publishedAt', ''),
-                        'url_to_image': article.get('urlToImage', ''),
-                        'company_searched': company_name
-                    }
+                    articles = page_data['articles']
+                    if not articles:
+                        print("No more articles found.")
+                        break
                     
-                    articles_data.append(article_data)
-                    articles_fetched += 1
-                
-                # Check if we need to fetch more pages
-                total_results = data.get('totalResults', 0)
-                if articles_fetched >= total_results or len(articles) < params['pageSize']:
-                    break
-                
-                params['page'] += 1
-                time.sleep(0.1)  # Small delay to respect rate limits
+                    for article in articles[:max_articles - len(articles_data)]:
+                        articles_data.append(self._parse_article(article, company_name))
+                    
+                    if len(articles_data) >= max_articles or len(articles) < page_size:
+                        break
                 
         except requests.exceptions.RequestException as e:
             print(f"Network error: {e}")
@@ -119,17 +145,50 @@ class NewsAPIFetcher:
         
         return df
     
-    def save_to_csv(self, df, filename=None):
+    def _fetch_page(self, params):
         """
-        Save DataFrame to CSV file
+        Fetch a single page of results from NewsAPI
         
         Args:
-            df (pd.DataFrame): DataFrame to save
-            filename (str): Optional filename, uses env var if not provided
+            params (dict): Query parameters, including the page number
+            
+        Returns:
+            dict: Parsed JSON response
         """
-        if filename is None:
-            filename = os.getenv('OUTPUT_CSV', 'articles.csv')
+        response = self.session.get(self.base_url, params=params)
+        response.raise_for_status()
+        return response.json()
+    
+    def _parse_article(self, article, company_name):
+        """
+        Convert a raw NewsAPI article into a flat record
+        
+        Args:
+            article (dict): Article as returned by NewsAPI
+            company_name (str): Company that was searched for
+            
+        Returns:
+            dict: Article record
+        """
+        return {
+            'title': article.get('title', ''),
+            'description': article.get('description', ''),
+            'content': article.get('content', ''),
+            'url': article.get('url', ''),
+            'source': article.get('source', {}).get('name', ''),
+            'author': article.get('author', ''),
+            'published_at': article.get('publishedAt', ''),
+            'url_to_image': article.get('urlToImage', ''),
+            'company_searched': company_name
+        }
+    
+    def _get_data_dir(self):
+        """
+        Resolve (and create if needed) the data/raw directory used for saved files
         
+        Returns:
+            str: Directory to save data files in
+        """
         # Get the project root directory (go up 3 levels from this file)
         current_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.dirname(os.path.dirname(current_dir))
@@ -148,9 +207,44 @@ class NewsAPIFetcher:
             data_dir = os.getcwd()
             print(f"Saving to current directory instead: {data_dir}")
         
-        filepath = os.path.join(data_dir, filename)
+        return data_dir
+    
+    def save_to_csv(self, df, filename=None, chunksize=10_000):
+        """
+        Save DataFrame to CSV file
+        
+        Args:
+            df (pd.DataFrame): DataFrame to save
+            filename (str): Optional filename, uses env var if not provided
+            chunksize (int): Rows serialized per write, bounding peak memory on large frames
+        """
+        if filename is None:
+            filename = os.getenv('OUTPUT_CSV', 'articles.csv')
+        
+        # A .parquet filename gets the faster, dtype-preserving format
+        if filename.endswith('.parquet'):
+            return self.save_to_parquet(df, filename)
+        
+        filepath = os.path.join(self._get_data_dir(), filename)
+        
+        df.to_csv(filepath, index=False, chunksize=chunksize)
+        print(f"Data saved to {filepath}")
+        return filepath
+    
+    def save_to_parquet(self, df, filename=None):
+        """
+        Save DataFrame to a Parquet file (faster to reload than CSV and keeps dtypes)
+        
+        Args:
+            df (pd.DataFrame): DataFrame to save
+            filename (str): Optional filename, uses env var if not provided
+        """
+        if filename is None:
+            filename = os.getenv('OUTPUT_PARQUET', 'articles.parquet')
         
-        df.to_csv(filepath, index=False)
+        filepath = os.path.join(self._get_data_dir(), filename)
+        
+        df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
         print(f"Data saved to {filepath}")
         return filepath
     
@@ -175,11 +269,15 @@ class NewsAPIFetcher:
         print("Removing entries with missing titles or descriptions...")
         df_cleaned = df.dropna(subset=['title', 'description'])
         
-        # Also remove entries where title or description are empty strings
-        df_cleaned = df_cleaned[
-            (df_cleaned['title'].str.strip() != '') & 
-            (df_cleaned['description'].str.strip() != '')
-        ]
+        # Clean text fields first: collapse line breaks and strip whitespace from title and description
+        df_cleaned = df_cleaned.assign(
+            title=df_cleaned['title'].str.replace(r'[\r\n]+', ' ', regex=True).str.strip(),
+            description=df_cleaned['description'].str.replace(r'[\r\n]+', ' ', regex=True).str.strip()
+        )
+        
+        # Also remove entries where title or description are empty (already stripped)
+        mask = (df_cleaned['title'].str.len() > 0) & (df_cleaned['description'].str.len() > 0)
+        df_cleaned = df_cleaned.loc[mask]
         
         missing_removed = initial_count - len(df_cleaned)
         print(f"Removed {missing_removed} entries with missing title/description")
@@ -188,10 +286,7 @@ class NewsAPIFetcher:
         print("Removing duplicate articles...")
         before_dedup = len(df_cleaned)
         
-        # Remove duplicates based on title and url (keep first occurrence)
-        df_cleaned = df_cleaned.drop_duplicates(subset=['title', 'url'], keep='first')
-        
-        # Also check for similar titles (case-insensitive)
+        # Remove duplicate titles (keep first occurrence); this also covers repeated title+url pairs
         df_cleaned = df_cleaned.drop_duplicates(subset=['title'], keep='first')
         
         duplicates_removed = before_dedup - len(df_cleaned)
@@ -203,22 +298,22 @@ class NewsAPIFetcher:
             # Convert to datetime if not already done
             df_cleaned['published_at'] = pd.to_datetime(df_cleaned['published_at'])
             
-            # Create additional date columns for analysis
-            df_cleaned['date'] = df_cleaned['published_at'].dt.date
-            df_cleaned['year'] = df_cleaned['published_at'].dt.year
-            df_cleaned['month'] = df_cleaned['published_at'].dt.month
-            df_cleaned['day'] = df_cleaned['published_at'].dt.day
-            df_cleaned['hour'] = df_cleaned['published_at'].dt.hour
+            # Create additional date columns for analysis (small nullable integer dtypes keep them
+            # compact and leave missing dates as <NA> instead of failing the whole conversion)
+            dt = df_cleaned['published_at'].dt
+            df_cleaned = df_cleaned.assign(
+                date=dt.date,
+                year=dt.year.astype('Int16'),
+                month=dt.month.astype('Int8'),
+                day=dt.day.astype('Int8'),
+                hour=dt.hour.astype('Int8')
+            )
             
         except Exception as e:
             print(f"Warning: Error processing dates: {e}")
         
-        # 4. Clean text fields
-        print("Cleaning text fields...")
-        
-        # Remove extra whitespace and newlines from title and description
-        df_cleaned['title'] = df_cleaned['title'].str.strip().str.replace('\n', ' ').str.replace('\r', ' ')
-        df_cleaned['description'] = df_cleaned['description'].str.strip().str.replace('\n', ' ').str.replace('\r', ' ')
+        # 4. Remove placeholder text fields
+        print("Removing placeholder articles...")
         
         # Remove entries where title is just "[Removed]" (common in NewsAPI)
         df_cleaned = df_cleaned[df_cleaned['title'] != '[Removed]']
@@ -231,25 +326,23 @@ class NewsAPIFetcher:
         # This is a basic filter - can be enhanced based on requirements
         company_keywords = df_cleaned['company_searched'].iloc[0].lower().split()
         
-        def is_relevant(row):
-            title_lower = row['title'].lower()
-            desc_lower = row['description'].lower()
-            
-            # Check if any company keyword appears in title or description
-            for keyword in company_keywords:
-                if len(keyword) > 2 and (keyword in title_lower or keyword in desc_lower):
-                    return True
-            return False
-        
-        df_cleaned['is_relevant'] = df_cleaned.apply(is_relevant, axis=1)
-        relevant_articles = df_cleaned[df_cleaned['is_relevant']].copy()
+        # Match any keyword longer than 2 characters in the title or description (one regex pass per column)
+        keywords = [re.escape(keyword) for keyword in company_keywords if len(keyword) > 2]
+        if keywords:
+            # Compile once and reuse for both columns
+            keyword_re = re.compile('|'.join(keywords), re.IGNORECASE)
+            mask = (
+                df_cleaned['title'].str.contains(keyword_re, na=False) |
+                df_cleaned['description'].str.contains(keyword_re, na=False)
+            )
+        else:
+            mask = pd.Series(False, index=df_cleaned.index)
+        
+        relevant_articles = df_cleaned.loc[mask]
         irrelevant_removed = len(df_cleaned) - len(relevant_articles)
         
         print(f"Removed {irrelevant_removed} potentially irrelevant articles")
         
-        # Drop the helper column
-        relevant_articles = relevant_articles.drop('is_relevant', axis=1)
-        
         # 6. Reset index
         relevant_articles = relevant_articles.reset_index(drop=True)
         
@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+from data_fetcher.data_storage import NEWS_DTYPES
 
 def check_datetime_format():
     """Check the datetime format in existing CSV files"""
@@ -16,7 +17,8 @@ def check_datetime_format():
         csv_path = os.path.join(data_dir, csv_file)
         
         try:
-            df = pd.read_csv(csv_path)
+            # Known text columns skip type inference; published_at is parsed below on purpose
+            df = pd.read_csv(csv_path, dtype=NEWS_DTYPES)
             
             if 'published_at' in df.columns:
                 print(f"\n📁 File: {csv_file}")
@@ -0,0 +1,23 @@
+import os
+from dotenv import load_dotenv
+from sentiment_analysis.quantization import DEFAULT_MODEL, quantize_model
+
+def main():
+    """
+    Quantize the configured sentiment model
+    """
+    load_dotenv()
+
+    model_name = os.getenv('SENTIMENT_MODEL', DEFAULT_MODEL)
+    output_dir = os.getenv('SENTIMENT_ONNX_DIR')
+
+    try:
+        output_dir = quantize_model(model_name, output_dir)
+        print(f"Set SENTIMENT_ONNX_DIR={output_dir} to use it in the analyzer")
+    except ImportError:
+        print("❌ optimum is not installed. Run: pip install optimum[onnxruntime]")
+    except Exception as e:
+        print(f"❌ Error quantizing model: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .analyzer import SentimentAnalyzer
-from .quick_analyzer import analyze_sentiment
+from .quick_analyzer import analyze_sentiment, analyze_sentiment_batch
+from .quantization import quantize_model
 
-__all__ = ['SentimentAnalyzer', 'analyze_sentiment']
\ No newline at end of file
+__all__ = ['SentimentAnalyzer', 'analyze_sentiment', 'analyze_sentiment_batch', 'quantize_model']
\ No newline at end of file
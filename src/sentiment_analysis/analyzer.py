@@ -1,39 +1,164 @@
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+import torch
+import os
+import hashlib
+import functools
+import threading
+import diskcache
+from torch.utils.data import DataLoader
+from .quantization import quantize_model
+from .labels import label_indices, labels_from_scores
 import pandas as pd
 import numpy as np
 from typing import Union, List, Dict
 import warnings
 warnings.filterwarnings("ignore")
 
+# Persistent cache of sentiment results keyed by model + text hash, shared across runs
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SENTIMENT_CACHE_DIR = os.path.join(_PROJECT_ROOT, '.cache', 'sentiment')
+
+# Opened lazily once per process: its SQLite connection must not be inherited across a fork
+# (e.g. by gunicorn workers forked from a preloaded master)
+_sentiment_cache = None
+_sentiment_cache_pid = None
+_sentiment_cache_lock = threading.Lock()
+
+def _get_sentiment_cache() -> diskcache.Cache:
+    """Return this process's handle on the persistent sentiment cache, opening it on first use"""
+    global _sentiment_cache, _sentiment_cache_pid
+    pid = os.getpid()
+    if _sentiment_cache_pid != pid:
+        with _sentiment_cache_lock:
+            if _sentiment_cache_pid != pid:
+                _sentiment_cache = diskcache.Cache(SENTIMENT_CACHE_DIR)
+                _sentiment_cache_pid = pid
+    return _sentiment_cache
+
+def _tokenize_batch(tokenizer, texts: List[str]):
+    """DataLoader collate function: tokenize one mini-batch of texts into padded tensors"""
+    return tokenizer(texts, truncation=True, max_length=512, padding=True, return_tensors='pt')
+
+def _configure_cpu_threads():
+    """Use every core for intra-op work unless OMP_NUM_THREADS already pins the thread count"""
+    if os.getenv('OMP_NUM_THREADS'):
+        return
+    try:
+        torch.set_num_threads(os.cpu_count() or 1)
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        # Inter-op threads can only be set before any parallel work has started
+        pass
+
+# Result used for empty texts and failed inference
+NEUTRAL_RESULT = {
+    'label': 'neutral',
+    'confidence': 0.0,
+    'positive_score': 0.0,
+    'negative_score': 0.0
+}
+
 class SentimentAnalyzer:
     """
     A class to analyze sentiment of news articles using pre-trained models
     """
     
-    def __init__(self, model_name="distilbert-base-uncased-finetuned-sst-2-english"):
+    def __init__(self, model_name="distilbert-base-uncased-finetuned-sst-2-english", onnx_model_dir=None,
+                 num_workers=0):
         """
         Initialize the sentiment analyzer with a pre-trained model
         
         Args:
             model_name (str): Hugging Face model name for sentiment analysis
+            onnx_model_dir (str): Optional directory with an int8 ONNX export of the model
+                (see quantize_sentiment_model.py); defaults to SENTIMENT_ONNX_DIR
+            num_workers (int): DataLoader worker processes that tokenize upcoming batches
+                while the model runs (0 tokenizes in the calling thread)
         """
         self.model_name = model_name
-        print(f"Loading sentiment analysis model: {model_name}")
+        self.num_workers = num_workers
+        
+        if not torch.cuda.is_available():
+            _configure_cpu_threads()
+        
+        if onnx_model_dir is None:
+            onnx_model_dir = os.getenv('SENTIMENT_ONNX_DIR')
+        
+        # Opt-in: export and int8-quantize the model on first use when no export exists yet
+        quantize = os.getenv('SENTIMENT_QUANTIZE', '').lower() in ('1', 'true', 'yes')
+        if quantize and not torch.cuda.is_available() and not (onnx_model_dir and os.path.isdir(onnx_model_dir)):
+            if onnx_model_dir is None:
+                onnx_model_dir = os.path.join(_PROJECT_ROOT, '.cache', 'onnx_int8', model_name.replace('/', '--'))
+            try:
+                quantize_model(model_name, onnx_model_dir)
+            except Exception as e:
+                print(f"❌ Error quantizing model: {e}")
+        
+        # Prefer the quantized ONNX model on CPU when one has been exported
+        self.sentiment_pipeline = None
+        if onnx_model_dir and os.path.isdir(onnx_model_dir) and not torch.cuda.is_available():
+            try:
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                
+                print(f"Loading quantized ONNX sentiment model from: {onnx_model_dir}")
+                ort_model = ORTModelForSequenceClassification.from_pretrained(onnx_model_dir)
+                self.sentiment_pipeline = pipeline(
+                    "sentiment-analysis",
+                    model=ort_model,
+                    tokenizer=AutoTokenizer.from_pretrained(onnx_model_dir, use_fast=True),
+                    top_k=None
+                )
+                self.device = 'cpu'
+                print("✅ Model loaded successfully!")
+            except Exception as e:
+                print(f"❌ Error loading ONNX model: {e}")
+                print(f"Falling back to {model_name}...")
+        
+        if self.sentiment_pipeline is None:
+            self._load_torch_pipeline(model_name)
+        
+        # Batched scoring calls the tokenizer and model directly (see _score_batch)
+        self.tokenizer = self.sentiment_pipeline.tokenizer
+        self.model = self.sentiment_pipeline.model
+        
+        # Read class probabilities by index instead of matching label strings per result
+        self.pos_idx, self.neg_idx = label_indices(self.model)
+    
+    def _load_torch_pipeline(self, model_name: str):
+        """
+        Load the Hugging Face torch pipeline, on the GPU in half precision when available
+        
+        Args:
+            model_name (str): Hugging Face model name for sentiment analysis
+        """
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        pipeline_device = 0 if self.device == 'cuda' else -1
+        torch_dtype = torch.float16 if self.device == 'cuda' else None
+        print(f"Loading sentiment analysis model: {model_name} (device: {self.device})")
         
         try:
-            # Initialize the sentiment analysis pipeline
+            # Initialize the sentiment analysis pipeline with the Rust-backed fast tokenizer
             self.sentiment_pipeline = pipeline(
                 "sentiment-analysis",
                 model=model_name,
-                tokenizer=model_name,
-                return_all_scores=True
+                tokenizer=AutoTokenizer.from_pretrained(model_name, use_fast=True),
+                top_k=None,
+                device=pipeline_device,
+                torch_dtype=torch_dtype
             )
             print("✅ Model loaded successfully!")
             
         except Exception as e:
             print(f"❌ Error loading model: {e}")
             print("Falling back to default model...")
-            self.sentiment_pipeline = pipeline("sentiment-analysis", return_all_scores=True)
+            self.sentiment_pipeline = pipeline(
+                "sentiment-analysis",
+                top_k=None,
+                device=pipeline_device,
+                torch_dtype=torch_dtype
+            )
+        
+        self.sentiment_pipeline.model.eval()
     
     def analyze_text(self, text: str) -> Dict[str, Union[str, float]]:
         """
@@ -45,73 +170,133 @@ class SentimentAnalyzer:
         Returns:
             dict: Dictionary containing sentiment label, confidence, and scores
         """
-        if not text or text.strip() == "":
-            return {
-                'label': 'neutral',
-                'confidence': 0.0,
-                'positive_score': 0.0,
-                'negative_score': 0.0
-            }
+        return self.analyze_texts([text])[0]
+    
+    def warm_up(self):
+        """
+        Run one forward pass so the first real request doesn't pay allocation costs
         
-        try:
-            # Truncate text if too long (BERT models have token limits)
-            text = text[:512]
+        Goes straight to the model: analyze_text would be answered by the disk cache
+        after the first run and never reach it.
+        """
+        self._score_batch(["warmup"])
+    
+    def _score_batch(self, texts: List[str], batch_size: int = 32):
+        """
+        Run the model directly on pre-tokenized mini-batches
+        
+        Args:
+            texts (list): Non-empty texts to score
+            batch_size (int): Number of texts per forward pass
             
-            # Get sentiment scores
-            results = self.sentiment_pipeline(text)[0]
+        Returns:
+            tuple: (positive_scores, negative_scores) as NumPy arrays
+        """
+        loader = DataLoader(
+            texts,
+            batch_size=batch_size,
+            num_workers=self.num_workers,
+            collate_fn=functools.partial(_tokenize_batch, self.tokenizer)
+        )
+        
+        probability_batches = []
+        for encoded in loader:
+            encoded = {key: value.to(self.model.device) for key, value in encoded.items()}
             
-            # Extract scores
-            positive_score = 0.0
-            negative_score = 0.0
+            with torch.inference_mode():
+                logits = self.model(**encoded).logits
+            probability_batches.append(logits.float().softmax(dim=-1).cpu().numpy())
+        
+        probabilities = np.concatenate(probability_batches)
+        positive = probabilities[:, self.pos_idx] if self.pos_idx is not None else np.zeros(len(texts))
+        negative = probabilities[:, self.neg_idx] if self.neg_idx is not None else np.zeros(len(texts))
+        return positive, negative
+    
+    def analyze_texts(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Union[str, float]]]:
+        """
+        Analyze sentiment of many texts, running the model in batches
+        
+        Cached texts are served from the sentiment cache and only the unique
+        misses go through the model.
+        
+        Args:
+            texts (list): Texts to analyze
+            batch_size (int): Number of texts per forward pass
             
-            for result in results:
-                if result['label'].upper() in ['POSITIVE', 'POS']:
-                    positive_score = result['score']
-                elif result['label'].upper() in ['NEGATIVE', 'NEG']:
-                    negative_score = result['score']
+        Returns:
+            list: One result dict per input text, in input order
+        """
+        results = [None] * len(texts)
+        # Cache misses grouped by key, so repeated texts in one call are scored once
+        pending = {}
+        miss_texts = []
+        sentiment_cache = _get_sentiment_cache()
+        
+        for i, text in enumerate(texts):
+            if not text or text.strip() == "":
+                results[i] = dict(NEUTRAL_RESULT)
+                continue
             
-            # Determine primary sentiment
-            if positive_score > negative_score:
-                if positive_score > 0.6:  # Strong positive
-                    label = 'positive'
-                    confidence = positive_score
-                else:  # Weak positive, classify as neutral
-                    label = 'neutral'
-                    confidence = max(positive_score, negative_score)
-            elif negative_score > positive_score:
-                if negative_score > 0.6:  # Strong negative
-                    label = 'negative'
-                    confidence = negative_score
-                else:  # Weak negative, classify as neutral
-                    label = 'neutral'
-                    confidence = max(positive_score, negative_score)
-            else:
-                label = 'neutral'
-                confidence = max(positive_score, negative_score)
+            # Truncate text if too long (BERT models have token limits)
+            text = text[:512]
+            cache_key = self._cache_key(text)
+            if cache_key in pending:
+                pending[cache_key].append(i)
+                continue
             
-            return {
-                'label': label,
-                'confidence': confidence,
-                'positive_score': positive_score,
-                'negative_score': negative_score
-            }
+            cached = sentiment_cache.get(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[cache_key] = [i]
+                miss_texts.append(text)
+        
+        if miss_texts:
+            try:
+                positive, negative = self._score_batch(miss_texts, batch_size)
+                labels, confidence = labels_from_scores(positive, negative)
+                
+                for (cache_key, indices), label, conf, pos, neg in zip(pending.items(), labels.tolist(), confidence.tolist(),
+                                                                      positive.tolist(), negative.tolist()):
+                    result = {
+                        'label': label,
+                        'confidence': conf,
+                        'positive_score': pos,
+                        'negative_score': neg
+                    }
+                    sentiment_cache.set(cache_key, result)
+                    for i in indices:
+                        results[i] = dict(result)
+            except Exception as e:
+                print(f"Error analyzing texts: {e}")
+                for indices in pending.values():
+                    for i in indices:
+                        results[i] = dict(NEUTRAL_RESULT)
+        
+        return results
+    
+    def _cache_key(self, text: str) -> str:
+        """
+        Build the sentiment cache key for a text
+        
+        Args:
+            text (str): Text to analyze (already truncated)
             
-        except Exception as e:
-            print(f"Error analyzing text: {e}")
-            return {
-                'label': 'neutral',
-                'confidence': 0.0,
-                'positive_score': 0.0,
-                'negative_score': 0.0
-            }
+        Returns:
+            str: blake2b digest of the loaded model's name and the text
+        """
+        # Key on the model actually loaded (fallback/ONNX models score differently)
+        model_id = getattr(self.sentiment_pipeline.model.config, '_name_or_path', self.model_name)
+        return hashlib.blake2b(f"{model_id}\0{text}".encode(), digest_size=16).hexdigest()
     
-    def analyze_dataframe(self, df: pd.DataFrame, text_column: str = 'title') -> pd.DataFrame:
+    def analyze_dataframe(self, df: pd.DataFrame, text_column: str = 'title', copy: bool = True) -> pd.DataFrame:
         """
         Analyze sentiment for all texts in a DataFrame
         
         Args:
             df (pd.DataFrame): DataFrame containing text data
             text_column (str): Name of the column containing text to analyze
+            copy (bool): Work on a copy (pass False to add the columns to df in place)
             
         Returns:
             pd.DataFrame: DataFrame with added sentiment columns
@@ -122,31 +307,39 @@ class SentimentAnalyzer:
             print(f"Error: Column '{text_column}' not found in DataFrame")
             return df
         
-        # Create a copy to avoid modifying original
-        df_sentiment = df.copy()
-        
-        # Initialize sentiment columns
-        df_sentiment['sentiment_label'] = ''
-        df_sentiment['sentiment_confidence'] = 0.0
-        df_sentiment['positive_score'] = 0.0
-        df_sentiment['negative_score'] = 0.0
+        # Callers that own df can skip the copy and have the sentiment columns added in place
+        df_sentiment = df.copy() if copy else df
         
-        # Analyze each text
-        for idx, row in df_sentiment.iterrows():
-            if idx % 10 == 0:  # Progress indicator
-                print(f"Processing article {idx + 1}/{len(df_sentiment)}")
-            
-            text = str(row[text_column])
-            sentiment_result = self.analyze_text(text)
-            
-            df_sentiment.at[idx, 'sentiment_label'] = sentiment_result['label']
-            df_sentiment.at[idx, 'sentiment_confidence'] = sentiment_result['confidence']
-            df_sentiment.at[idx, 'positive_score'] = sentiment_result['positive_score']
-            df_sentiment.at[idx, 'negative_score'] = sentiment_result['negative_score']
+        # Score all texts in batched forward passes
+        texts = df_sentiment[text_column].fillna('').astype(str).str.slice(0, 512).tolist()
+        self._assign_results(df_sentiment, self.analyze_texts(texts))
         
         print("✅ Sentiment analysis completed!")
         return df_sentiment
     
+    def analyze_csv(self, input_path: str, output_path: str, text_column: str = 'title',
+                    chunksize: int = 1000) -> str:
+        """
+        Analyze a large CSV chunk by chunk, appending results to an output CSV
+        
+        Only one chunk is held in memory at a time.
+        
+        Args:
+            input_path (str): CSV file containing text data
+            output_path (str): CSV file to write rows with sentiment columns to
+            text_column (str): Name of the column containing text to analyze
+            chunksize (int): Number of rows per chunk
+            
+        Returns:
+            str: Path of the output CSV
+        """
+        for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+            df_chunk = self.analyze_dataframe(chunk, text_column, copy=False)
+            df_chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        
+        print(f"✅ Results saved to: {output_path}")
+        return output_path
+    
     def get_sentiment_summary(self, df: pd.DataFrame) -> Dict:
         """
         Generate a summary of sentiment analysis results
@@ -179,12 +372,13 @@ class SentimentAnalyzer:
         
         return summary
     
-    def analyze_combined_text(self, df: pd.DataFrame) -> Dict:
+    def analyze_combined_text(self, df: pd.DataFrame, copy: bool = True) -> Dict:
         """
         Analyze sentiment using both title and description
         
         Args:
             df (pd.DataFrame): DataFrame with title and description columns
+            copy (bool): Work on a copy (pass False to add the columns to df in place)
             
         Returns:
             dict: Combined sentiment analysis
@@ -192,82 +386,86 @@ class SentimentAnalyzer:
         print("Analyzing combined sentiment (title + description)...")
         
         # Combine title and description
-        df_combined = df.copy()
+        df_combined = df.copy() if copy else df
         df_combined['combined_text'] = df_combined['title'].fillna('') + ' ' + df_combined['description'].fillna('')
         
         # Analyze combined text
-        df_combined = self.analyze_dataframe(df_combined, 'combined_text')
+        self.analyze_dataframe(df_combined, 'combined_text', copy=False)
         
-        # Rename columns to indicate combined analysis
-        df_combined = df_combined.rename(columns={
+        # Rename columns to indicate combined analysis and drop the scratch text column
+        df_combined.rename(columns={
             'sentiment_label': 'combined_sentiment_label',
             'sentiment_confidence': 'combined_sentiment_confidence',
             'positive_score': 'combined_positive_score',
             'negative_score': 'combined_negative_score'
-        })
+        }, inplace=True)
+        df_combined.drop(columns=['combined_text'], inplace=True)
         
         return df_combined
     
-    def analyze_dataframe_comprehensive(self, df: pd.DataFrame) -> pd.DataFrame:
+    def analyze_dataframe_comprehensive(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """
         Comprehensive sentiment analysis for both title and description columns
         
         Args:
             df (pd.DataFrame): DataFrame containing news articles
+            copy (bool): Work on a copy (pass False to add the columns to df in place)
             
         Returns:
             pd.DataFrame: DataFrame with sentiment analysis for title, description, and combined
         """
         print(f"Starting comprehensive sentiment analysis for {len(df)} articles...")
         
-        # Create a copy to avoid modifying original
-        df_sentiment = df.copy()
+        # Callers that own df can skip the copy and have the sentiment columns added in place
+        df_sentiment = df.copy() if copy else df
         
-        # Initialize all sentiment columns
-        columns_to_add = [
-            'title_sentiment_label', 'title_sentiment_confidence', 'title_positive_score', 'title_negative_score',
-            'description_sentiment_label', 'description_sentiment_confidence', 'description_positive_score', 'description_negative_score',
-            'combined_sentiment_label', 'combined_sentiment_confidence', 'combined_positive_score', 'combined_negative_score'
-        ]
+        # Build the three text variants and score them as one batched list of 3N texts
+        n = len(df_sentiment)
+        titles = self._text_column(df_sentiment, 'title')
+        descriptions = self._text_column(df_sentiment, 'description')
+        combined = titles.str.cat(descriptions, sep=' ').str.strip()
         
-        for col in columns_to_add:
-            df_sentiment[col] = 0.0 if 'score' in col or 'confidence' in col else 'neutral'
+        # One tokenizer/padding layout for all three corpora; the 3N list fills larger batches
+        print(f"Scoring {3 * n} texts (title, description, combined)...")
+        all_texts = titles.tolist() + descriptions.tolist() + combined.tolist()
+        results = self.analyze_texts(all_texts, batch_size=64)
         
-        # Analyze each article
-        for idx, row in df_sentiment.iterrows():
-            if idx % 5 == 0:  # Progress indicator every 5 articles
-                print(f"Processing article {idx + 1}/{len(df_sentiment)}")
-            
-            # 1. Analyze Title
-            title = str(row.get('title', ''))
-            title_sentiment = self.analyze_text(title)
-            
-            df_sentiment.at[idx, 'title_sentiment_label'] = title_sentiment['label']
-            df_sentiment.at[idx, 'title_sentiment_confidence'] = title_sentiment['confidence']
-            df_sentiment.at[idx, 'title_positive_score'] = title_sentiment['positive_score']
-            df_sentiment.at[idx, 'title_negative_score'] = title_sentiment['negative_score']
-            
-            # 2. Analyze Description
-            description = str(row.get('description', ''))
-            desc_sentiment = self.analyze_text(description)
-            
-            df_sentiment.at[idx, 'description_sentiment_label'] = desc_sentiment['label']
-            df_sentiment.at[idx, 'description_sentiment_confidence'] = desc_sentiment['confidence']
-            df_sentiment.at[idx, 'description_positive_score'] = desc_sentiment['positive_score']
-            df_sentiment.at[idx, 'description_negative_score'] = desc_sentiment['negative_score']
-            
-            # 3. Analyze Combined Text
-            combined_text = f"{title} {description}".strip()
-            combined_sentiment = self.analyze_text(combined_text)
-            
-            df_sentiment.at[idx, 'combined_sentiment_label'] = combined_sentiment['label']
-            df_sentiment.at[idx, 'combined_sentiment_confidence'] = combined_sentiment['confidence']
-            df_sentiment.at[idx, 'combined_positive_score'] = combined_sentiment['positive_score']
-            df_sentiment.at[idx, 'combined_negative_score'] = combined_sentiment['negative_score']
+        self._assign_results(df_sentiment, results[:n], 'title_')
+        self._assign_results(df_sentiment, results[n:2 * n], 'description_')
+        self._assign_results(df_sentiment, results[2 * n:], 'combined_')
         
         print("✅ Comprehensive sentiment analysis completed!")
         return df_sentiment
     
+    def _assign_results(self, df: pd.DataFrame, results: List[Dict], prefix: str = '') -> None:
+        """
+        Write sentiment results into df as whole columns (one assignment per column)
+        
+        Args:
+            df (pd.DataFrame): DataFrame to update in place, row-aligned with results
+            results (list): Result dicts from analyze_texts
+            prefix (str): Column name prefix, e.g. 'title_'
+        """
+        df[f'{prefix}sentiment_label'] = [r['label'] for r in results]
+        df[f'{prefix}sentiment_confidence'] = np.array([r['confidence'] for r in results], dtype=float)
+        df[f'{prefix}positive_score'] = np.array([r['positive_score'] for r in results], dtype=float)
+        df[f'{prefix}negative_score'] = np.array([r['negative_score'] for r in results], dtype=float)
+    
+    def _text_column(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """
+        Get a text column as clean strings (missing column/values become '')
+        
+        Args:
+            df (pd.DataFrame): DataFrame containing news articles
+            column (str): Column name
+            
+        Returns:
+            pd.Series: String Series aligned with df
+        """
+        if column not in df.columns:
+            return pd.Series('', index=df.index)
+        return df[column].fillna('').astype(str)
+    
     def get_comprehensive_summary(self, df: pd.DataFrame) -> Dict:
         """
         Generate comprehensive summary for title, description, and combined sentiment
@@ -0,0 +1,62 @@
+"""
+Label helpers shared by the sentiment analyzers
+
+Both analyzers read positive/negative probabilities from a classification
+model and turn them into 'positive'/'negative'/'neutral' labels the same way.
+"""
+import numpy as np
+
+# Model label names that mean positive/negative sentiment
+POS_LABELS = frozenset({'POSITIVE', 'POS'})
+NEG_LABELS = frozenset({'NEGATIVE', 'NEG'})
+BINARY_POS_LABELS = frozenset({'LABEL_1'})
+BINARY_NEG_LABELS = frozenset({'LABEL_0'})
+
+def label_indices(model):
+    """
+    Find the positive/negative output indices of a sentiment model
+    
+    Generic LABEL_0/LABEL_1 names are only trusted on two-label models, where
+    they follow the usual negative/positive order.
+    
+    Args:
+        model: Hugging Face (or ONNX Runtime) sequence classification model
+        
+    Returns:
+        tuple: (positive_idx, negative_idx); None when the model has no such label
+    """
+    id2label = model.config.id2label
+    positive_labels = POS_LABELS | BINARY_POS_LABELS if len(id2label) == 2 else POS_LABELS
+    negative_labels = NEG_LABELS | BINARY_NEG_LABELS if len(id2label) == 2 else NEG_LABELS
+    
+    positive_idx = None
+    negative_idx = None
+    for idx, label in id2label.items():
+        label_upper = label.upper()
+        if label_upper in positive_labels:
+            positive_idx = int(idx)
+        elif label_upper in negative_labels:
+            negative_idx = int(idx)
+    return positive_idx, negative_idx
+
+def labels_from_scores(positive_scores, negative_scores):
+    """
+    Map positive/negative scores to labels using the 0.6 threshold, over whole arrays
+    
+    A score wins only if it is both the larger of the two and above 0.6; anything
+    else is neutral. Confidence is the larger of the two scores.
+    
+    Args:
+        positive_scores (array-like): Positive class probabilities
+        negative_scores (array-like): Negative class probabilities
+        
+    Returns:
+        tuple: (labels, confidence) as NumPy arrays
+    """
+    positive_scores = np.asarray(positive_scores, dtype=float)
+    negative_scores = np.asarray(negative_scores, dtype=float)
+    
+    labels = np.where((positive_scores > negative_scores) & (positive_scores > 0.6), 'positive',
+                      np.where((negative_scores > positive_scores) & (negative_scores > 0.6), 'negative', 'neutral'))
+    confidence = np.maximum(positive_scores, negative_scores)
+    return labels, confidence
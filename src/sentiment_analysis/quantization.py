@@ -0,0 +1,42 @@
+import os
+
+DEFAULT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+def quantize_model(model_name: str = DEFAULT_MODEL, output_dir: str = None) -> str:
+    """
+    Export a sentiment model to ONNX and apply dynamic int8 quantization
+
+    Run once offline (quantize_sentiment_model.py), or on first use by
+    SentimentAnalyzer when SENTIMENT_QUANTIZE is set.
+
+    Args:
+        model_name (str): Hugging Face model name to export
+        output_dir (str): Directory for the quantized model (defaults to models/onnx_int8)
+
+    Returns:
+        str: Directory containing the quantized model and tokenizer
+    """
+    # optimum[onnxruntime] is only needed for this export step
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    if output_dir is None:
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output_dir = os.path.join(project_root, 'models', 'onnx_int8')
+
+    # Step 1: Export the torch model to ONNX
+    print(f"Exporting {model_name} to ONNX...")
+    ort_model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+
+    # Step 2: Dynamic int8 quantization (weights only, no calibration data needed)
+    print("Applying dynamic int8 quantization...")
+    quantizer = ORTQuantizer.from_pretrained(ort_model)
+    quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config)
+
+    # Step 3: Save the tokenizer next to the model so it loads from one directory
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    print(f"✅ Quantized model saved to: {output_dir}")
+    return output_dir
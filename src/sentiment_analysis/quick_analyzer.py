@@ -1,57 +1,262 @@
 from transformers import pipeline
+import torch
+import numpy as np
+import os
+import atexit
+import multiprocessing
+from typing import List, Union
+from cachetools import LRUCache
+from .labels import label_indices, labels_from_scores
+import threading
 import warnings
 warnings.filterwarnings("ignore")
 
-def analyze_sentiment(text: str, model_name: str = "distilbert-base-uncased-finetuned-sst-2-english") -> str:
+DEFAULT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Labels of recently scored texts, keyed by (model_name, truncated text); the model is deterministic
+_label_cache = LRUCache(maxsize=10000)
+_label_cache_lock = threading.Lock()
+
+# Process-wide pipelines by model name, each built on first use and shared by every caller
+_PIPELINES = {}
+# Model names whose pipeline runs a torch.compile'd model
+_COMPILED_MODELS = set()
+_pipeline_lock = threading.Lock()
+
+# Optional pool of inference worker processes, keyed by (n_instances, model_name)
+_POOL = None
+_POOL_KEY = None
+_pool_lock = threading.Lock()
+
+def _inference_dtype(use_cuda: bool):
+    """
+    Pick reduced-precision weights where they are safe to use by default
+    
+    bfloat16 on CPU is opt-in (SENTIMENT_CPU_BF16=1): it is only faster on CPUs with
+    native BF16 units (AMX/AVX512-BF16), elsewhere it is emulated, and it changes the scores slightly.
+    
+    Args:
+        use_cuda (bool): Whether the model will run on the GPU
+        
+    Returns:
+        torch.dtype or None: float16 on CUDA, bfloat16 on CPU when opted in, else None (fp32)
+    """
+    if use_cuda:
+        return torch.float16
+    if os.getenv('SENTIMENT_CPU_BF16', '').lower() in ('1', 'true', 'yes'):
+        return torch.bfloat16
+    return None
+
+def _get_pipeline(model_name: str = DEFAULT_MODEL):
+    """Initialize the sentiment pipeline for a model once per process and return the shared instance"""
+    sentiment_pipeline = _PIPELINES.get(model_name)
+    if sentiment_pipeline is None:
+        with _pipeline_lock:
+            sentiment_pipeline = _PIPELINES.get(model_name)
+            if sentiment_pipeline is None:
+                use_cuda = torch.cuda.is_available()
+                dtype = _inference_dtype(use_cuda)
+                with torch.inference_mode():
+                    sentiment_pipeline = pipeline(
+                        "sentiment-analysis",
+                        model=model_name,
+                        top_k=None,
+                        device=0 if use_cuda else -1,
+                        model_kwargs={'torch_dtype': dtype} if dtype is not None else {}
+                    )
+                    sentiment_pipeline.model.eval()
+                    if use_cuda and _compile_model(sentiment_pipeline):
+                        _COMPILED_MODELS.add(model_name)
+                _PIPELINES[model_name] = sentiment_pipeline
+    return sentiment_pipeline
+
+def _compile_model(sentiment_pipeline) -> bool:
+    """
+    Compile the pipeline's model with torch.compile (CUDA only) and warm it up
+    
+    CUDA graphs in "reduce-overhead" mode need static shapes, so compiled
+    batches are padded to max_length. Falls back to eager mode on any error.
+    
+    Returns:
+        bool: True if the compiled model is in use
+    """
+    eager_model = sentiment_pipeline.model
+    try:
+        compiled_model = torch.compile(eager_model, mode="reduce-overhead", fullgraph=False)
+        warmup = sentiment_pipeline.tokenizer(["warmup"], padding='max_length', truncation=True,
+                                              max_length=512, return_tensors='pt').to(eager_model.device)
+        with torch.inference_mode():
+            compiled_model(**warmup)
+        sentiment_pipeline.model = compiled_model
+        return True
+    except Exception as e:
+        print(f"torch.compile unavailable, using eager model: {e}")
+        sentiment_pipeline.model = eager_model
+        return False
+
+def analyze_sentiment(texts: Union[str, List[str]], model_name: str = DEFAULT_MODEL) -> Union[str, List[str]]:
     """
     Quick sentiment analysis function that returns simple labels
     
     Args:
-        text (str): Text to analyze
+        texts (str or list): Text to analyze, or a list of texts to analyze as a batch
         model_name (str): Hugging Face model name
         
     Returns:
-        str: 'positive', 'negative', or 'neutral'
+        str or list: 'positive', 'negative', or 'neutral' (one label per text for a list)
+    """
+    if isinstance(texts, str):
+        if not texts.strip():
+            return 'neutral'
+        return analyze_sentiment_batch([texts], model_name)[0]
+    
+    return analyze_sentiment_batch(list(texts), model_name)
+
+def _score_texts(texts: List[str], model_name: str = DEFAULT_MODEL, batch_size: int = 32) -> List[str]:
     """
-    if not text or text.strip() == "":
-        return 'neutral'
+    Run the shared pipeline's model over non-empty texts in padded mini-batches
     
-    try:
-        # Initialize pipeline (cache it for better performance)
-        if not hasattr(analyze_sentiment, 'pipeline'):
-            analyze_sentiment.pipeline = pipeline(
-                "sentiment-analysis",
-                model=model_name,
-                return_all_scores=True
-            )
+    Args:
+        texts (list): Non-empty texts, already truncated to 512 characters
+        model_name (str): Hugging Face model name
+        batch_size (int): Number of texts per forward pass
         
-        # Truncate text if too long
-        text = text[:512]
+    Returns:
+        list: 'positive', 'negative', or 'neutral' for each input text
+    """
+    sentiment_pipeline = _get_pipeline(model_name)
+    tokenizer = sentiment_pipeline.tokenizer
+    model = sentiment_pipeline.model
+    device_type = model.device.type
+    
+    # Locate the positive/negative logits once per call
+    positive_idx, negative_idx = label_indices(model)
+    
+    labels = []
+    for start in range(0, len(texts), batch_size):
+        batch_texts = texts[start:start + batch_size]
         
-        # Get sentiment
-        results = analyze_sentiment.pipeline(text)[0]
+        # The compiled model replays CUDA graphs, which need a fixed input shape
+        padding = 'max_length' if model_name in _COMPILED_MODELS else True
+        encoded = tokenizer(batch_texts, padding=padding, truncation=True, max_length=512, return_tensors='pt')
+        encoded = {key: value.to(model.device, non_blocking=True) for key, value in encoded.items()}
         
-        # Find positive and negative scores
-        positive_score = 0.0
-        negative_score = 0.0
+        # fp16 autocast only pays off on CUDA; on CPU this runs in fp32 as before
+        with torch.inference_mode(), torch.autocast(device_type=device_type, dtype=torch.float16,
+                                                    enabled=device_type == 'cuda'):
+            logits = model(**encoded).logits
+        probabilities = logits.float().softmax(dim=-1).cpu().numpy()
         
-        for result in results:
-            if result['label'].upper() in ['POSITIVE', 'POS']:
-                positive_score = result['score']
-            elif result['label'].upper() in ['NEGATIVE', 'NEG']:
-                negative_score = result['score']
+        zeros = np.zeros(len(batch_texts))
+        positive_scores = probabilities[:, positive_idx] if positive_idx is not None else zeros
+        negative_scores = probabilities[:, negative_idx] if negative_idx is not None else zeros
+        batch_labels, _ = labels_from_scores(positive_scores, negative_scores)
+        labels.extend(batch_labels.tolist())
+    
+    return labels
+
+def _init_worker(num_threads: int, model_name: str):
+    """Pin a pool worker to its share of the cores and load its own pipeline"""
+    torch.set_num_threads(num_threads)
+    _get_pipeline(model_name)
+
+def _score_shard(args):
+    """Pool entry point: score one shard of texts inside a worker process"""
+    texts, model_name, batch_size = args
+    return _score_texts(texts, model_name, batch_size)
+
+def _get_pool(n_instances: int, model_name: str):
+    """
+    Return a persistent pool of n_instances inference workers, creating it on first use
+    
+    Each worker gets cpu_count // n_instances intra-op threads so the instances
+    don't compete for the same cores.
+    """
+    global _POOL, _POOL_KEY
+    with _pool_lock:
+        if _POOL is None or _POOL_KEY != (n_instances, model_name):
+            if _POOL is not None:
+                _POOL.terminate()
+            num_threads = max(1, (os.cpu_count() or 1) // n_instances)
+            # Spawned, not forked: forking a process that already runs torch threads can deadlock
+            _POOL = multiprocessing.get_context('spawn').Pool(n_instances, initializer=_init_worker,
+                                         initargs=(num_threads, model_name))
+            _POOL_KEY = (n_instances, model_name)
+        return _POOL
+
+def _close_pool():
+    """Shut down the inference pool at interpreter exit"""
+    global _POOL, _POOL_KEY
+    with _pool_lock:
+        if _POOL is not None:
+            _POOL.terminate()
+            _POOL.join()
+            _POOL = None
+            _POOL_KEY = None
+
+atexit.register(_close_pool)
+
+def analyze_sentiment_batch(texts: List[str], model_name: str = DEFAULT_MODEL, batch_size: int = 32,
+                            n_instances: int = 1) -> List[str]:
+    """
+    Batched version of analyze_sentiment that runs the model on padded mini-batches
+    
+    On CPU-only hosts with many cores, uncached texts can be sharded across
+    n_instances spawned worker processes, each with its own pipeline and a
+    slice of the cores. The pool is opt-in, since every worker loads its own
+    copy of the model.
+    
+    Args:
+        texts (list): Texts to analyze
+        model_name (str): Hugging Face model name
+        batch_size (int): Number of texts per forward pass
+        n_instances (int): Inference processes to use (1 = in-process, the default)
         
-        # Determine sentiment with threshold
-        if positive_score > negative_score and positive_score > 0.6:
-            return 'positive'
-        elif negative_score > positive_score and negative_score > 0.6:
-            return 'negative'
+    Returns:
+        list: 'positive', 'negative', or 'neutral' for each input text
+    """
+    labels = ['neutral'] * len(texts)
+    
+    # Empty texts are neutral without running the model; cached texts skip it too.
+    # Misses are grouped by text so repeated headlines are scored once.
+    pending = {}
+    with _label_cache_lock:
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            key = (model_name, text[:512])
+            label = _label_cache.get(key)
+            if label is not None:
+                labels[i] = label
+            else:
+                pending.setdefault(key, []).append(i)
+    
+    if not pending:
+        return labels
+    miss_keys = list(pending)
+    miss_texts = [text for _, text in miss_keys]
+    
+    try:
+        # Several instances only help on CPU and when each gets at least a full batch
+        if n_instances > 1 and not torch.cuda.is_available() and len(miss_texts) > batch_size:
+            shard_size = -(-len(miss_texts) // n_instances)
+            shards = [(miss_texts[start:start + shard_size], model_name, batch_size)
+                      for start in range(0, len(miss_texts), shard_size)]
+            miss_labels = [label for shard in _get_pool(n_instances, model_name).map(_score_shard, shards)
+                           for label in shard]
         else:
-            return 'neutral'
-            
+            miss_labels = _score_texts(miss_texts, model_name, batch_size)
+        
+        with _label_cache_lock:
+            for key, label in zip(miss_keys, miss_labels):
+                _label_cache[key] = label
+                for i in pending[key]:
+                    labels[i] = label
+                
     except Exception as e:
-        print(f"Error in sentiment analysis: {e}")
-        return 'neutral'
+        print(f"Error in batch sentiment analysis: {e}")
+    
+    return labels
 
 # Example usage function
 def test_sentiment_function():
@@ -66,11 +271,14 @@ def test_sentiment_function():
     print("Testing sentiment analysis function:")
     print("-" * 50)
     
-    for text in test_texts:
-        sentiment = analyze_sentiment(text)
+    # Score all samples in one batch
+    sentiments = analyze_sentiment(test_texts)
+    
+    for text, sentiment in zip(test_texts, sentiments):
         print(f"Text: {text}")
         print(f"Sentiment: {sentiment}")
         print("-" * 50)
 
 if __name__ == "__main__":
+    _get_pipeline()
     test_sentiment_function()
\ No newline at end of file
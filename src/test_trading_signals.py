@@ -2,6 +2,9 @@ import pandas as pd
 from trading_logic.signal_generator import TradingSignalGenerator, generate_trading_signal
 import numpy as np
 
+# Seeded generator shared by all test scenarios so confidences are reproducible
+_RNG = np.random.default_rng(42)
+
 def create_test_scenarios():
     """Create different test scenarios for trading signals"""
     
@@ -33,19 +36,18 @@ def create_test_scenarios():
     }
     
     test_datasets = {}
+    labels = np.array(['positive', 'negative', 'neutral'])
     
     for scenario_name, counts in scenarios.items():
         # Create test data
-        sentiments = (['positive'] * counts['positive'] + 
-                     ['negative'] * counts['negative'] + 
-                     ['neutral'] * counts['neutral'])
+        sentiments = np.repeat(labels, [counts['positive'], counts['negative'], counts['neutral']])
         
         total_articles = len(sentiments)
         
         test_data = {
-            'title': [f'Test Article {i+1}' for i in range(total_articles)],
+            'title': np.char.add('Test Article ', np.arange(1, total_articles + 1).astype(str)),
             'combined_sentiment_label': sentiments,
-            'combined_sentiment_confidence': np.random.uniform(0.6, 0.9, total_articles),
+            'combined_sentiment_confidence': _RNG.uniform(0.6, 0.9, total_articles),
             'published_at': pd.date_range('2024-01-01', periods=total_articles, freq='D')
         }
         
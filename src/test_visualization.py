@@ -1,6 +1,7 @@
 import pandas as pd
 from visualization.sentiment_charts import SentimentVisualizer
 import numpy as np
+import logging
 
 def create_test_data():
     """Create test data for visualization"""
@@ -56,4 +57,5 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
\ No newline at end of file
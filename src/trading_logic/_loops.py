@@ -0,0 +1,141 @@
+"""
+Numeric kernels used by the trading signal generators
+
+The kernels take plain numpy arrays. With numba installed they are explicit
+single-pass loops compiled to machine code; numba is optional, and without it
+the same functions are vectorized np.bincount calls instead of Python loops.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Integer codes for sentiment labels; any other code is ignored by the kernels
+POSITIVE_CODE = 0
+NEGATIVE_CODE = 1
+NEUTRAL_CODE = 2
+
+def _count_labels_loop(codes):
+    """
+    Count entries per sentiment label in a single pass
+    
+    Args:
+        codes (np.ndarray): Sentiment codes (0=positive, 1=negative, 2=neutral)
+        
+    Returns:
+        tuple: (positive, negative, neutral) counts
+    """
+    positive = 0
+    negative = 0
+    neutral = 0
+    
+    for i in range(codes.shape[0]):
+        code = codes[i]
+        if code == 0:
+            positive += 1
+        elif code == 1:
+            negative += 1
+        elif code == 2:
+            neutral += 1
+    
+    return positive, negative, neutral
+
+def _label_tallies_loop(codes, weights):
+    """
+    Count entries and sum weights per sentiment label in a single pass
+    
+    Args:
+        codes (np.ndarray): Sentiment codes (0=positive, 1=negative, 2=neutral)
+        weights (np.ndarray): Finite float weight for each entry
+        
+    Returns:
+        tuple: (positive, negative, neutral) counts followed by (positive, negative, neutral) weight sums
+    """
+    positive_count = 0
+    negative_count = 0
+    neutral_count = 0
+    positive = 0.0
+    negative = 0.0
+    neutral = 0.0
+    
+    for i in range(codes.shape[0]):
+        code = codes[i]
+        if code == 0:
+            positive_count += 1
+            positive += weights[i]
+        elif code == 1:
+            negative_count += 1
+            negative += weights[i]
+        elif code == 2:
+            neutral_count += 1
+            neutral += weights[i]
+    
+    return positive_count, negative_count, neutral_count, positive, negative, neutral
+
+def _weighted_label_sums_loop(codes, weights):
+    """
+    Sum weights per sentiment label in a single pass
+    
+    Args:
+        codes (np.ndarray): Sentiment codes (0=positive, 1=negative, 2=neutral)
+        weights (np.ndarray): Finite float weight for each entry
+        
+    Returns:
+        tuple: (positive, negative, neutral) weight sums
+    """
+    positive = 0.0
+    negative = 0.0
+    neutral = 0.0
+    
+    for i in range(codes.shape[0]):
+        code = codes[i]
+        if code == 0:
+            positive += weights[i]
+        elif code == 1:
+            negative += weights[i]
+        elif code == 2:
+            neutral += weights[i]
+    
+    return positive, negative, neutral
+
+def _bincount_labels(codes, weights=None):
+    """
+    Count entries (or sum weights) per sentiment label with np.bincount
+    
+    Args:
+        codes (np.ndarray): Sentiment codes (0=positive, 1=negative, 2=neutral)
+        weights (np.ndarray): Finite float weight for each entry, or None to count
+        
+    Returns:
+        list: [positive, negative, neutral] counts or weight sums
+    """
+    valid = (codes >= POSITIVE_CODE) & (codes <= NEUTRAL_CODE)
+    if weights is not None:
+        weights = weights[valid]
+    return np.bincount(codes[valid], weights=weights, minlength=3).tolist()
+
+def _count_labels_vectorized(codes):
+    """Vectorized _count_labels_loop, used when numba is not installed"""
+    return tuple(_bincount_labels(codes))
+
+def _label_tallies_vectorized(codes, weights):
+    """Vectorized _label_tallies_loop, used when numba is not installed"""
+    return tuple(_bincount_labels(codes)) + tuple(_bincount_labels(codes, weights))
+
+def _weighted_label_sums_vectorized(codes, weights):
+    """Vectorized _weighted_label_sums_loop, used when numba is not installed"""
+    return tuple(_bincount_labels(codes, weights))
+
+# Compiled loops when numba is available; interpreted per-element loops would be slower than numpy.
+# No on-disk cache: this module is imported both as trading_logic._loops and src.trading_logic._loops,
+# and numba's cache index (keyed by file) would hand one import name's pickled kernels to the other
+if njit is not None:
+    _count_labels = njit(_count_labels_loop)
+    _label_tallies = njit(_label_tallies_loop)
+    _weighted_label_sums = njit(fastmath=True)(_weighted_label_sums_loop)
+else:
+    _count_labels = _count_labels_vectorized
+    _label_tallies = _label_tallies_vectorized
+    _weighted_label_sums = _weighted_label_sums_vectorized
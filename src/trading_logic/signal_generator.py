@@ -3,6 +3,44 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 import warnings
+import functools
+from ._loops import POSITIVE_CODE, NEGATIVE_CODE, NEUTRAL_CODE, _count_labels, _label_tallies, _weighted_label_sums
+
+# Rule printed above and below the signal summary
+SUMMARY_SEPARATOR = '=' * 60
+
+# Category order matches POSITIVE_CODE, NEGATIVE_CODE and NEUTRAL_CODE
+SENTIMENT_DTYPE = pd.CategoricalDtype(['positive', 'negative', 'neutral'])
+
+def _sentiment_codes(labels: pd.Series) -> np.ndarray:
+    """
+    Encode sentiment labels as int8 codes for the numeric kernels
+    
+    Args:
+        labels (pd.Series): Series of 'positive'/'negative'/'neutral' labels
+        
+    Returns:
+        np.ndarray: Codes (0=positive, 1=negative, 2=neutral, -1=anything else)
+    """
+    # Hash lookup against the categories gives the categorical codes directly; unlike
+    # astype(SENTIMENT_DTYPE) it doesn't warn (or, in future pandas, raise) on unknown labels
+    return SENTIMENT_DTYPE.categories.get_indexer(labels).astype(np.int8)
+
+def _label_counts(value_counts: pd.Series) -> Tuple[int, int, int]:
+    """
+    Turn a label value_counts() result into (positive, negative, neutral) counts
+    
+    Args:
+        value_counts (pd.Series): Article count per label
+        
+    Returns:
+        tuple: (positive, negative, neutral) counts
+    """
+    return tuple(int(value_counts.get(label, 0)) for label in SENTIMENT_DTYPE.categories)
+
+def _finite_weights(weights: pd.Series) -> np.ndarray:
+    """Convert a weight column to float64, treating missing values as zero like pandas sum()"""
+    return np.nan_to_num(weights.to_numpy(dtype=np.float64), nan=0.0)
 
 class TradingSignalGenerator:
     """
@@ -28,17 +66,38 @@ class TradingSignalGenerator:
         self.min_articles = min_articles
         self.confidence_weight = confidence_weight
     
-    def generate_basic_signal(self, df: pd.DataFrame, sentiment_column: str = 'combined_sentiment_label') -> Dict:
+    def generate_basic_signal(self, df: pd.DataFrame, sentiment_column: str = 'combined_sentiment_label',
+                              precomputed_counts: Optional[pd.Series] = None) -> Dict:
         """
         Generate basic trading signal based on sentiment counts
         
         Args:
             df (pd.DataFrame): DataFrame with sentiment analysis
             sentiment_column (str): Column containing sentiment labels
+            precomputed_counts (pd.Series): value_counts() of sentiment_column, if the caller already has it
             
         Returns:
             dict: Trading signal with detailed analysis
         """
+        insufficient = self._check_articles(df, sentiment_column)
+        if insufficient is not None:
+            return insufficient
+        
+        # Count sentiment distribution
+        counts, _ = self._tally(df, sentiment_column, counts=precomputed_counts)
+        return self._signal_from_counts(counts, len(df), sentiment_column)
+    
+    def _check_articles(self, df: pd.DataFrame, sentiment_column: str) -> Optional[Dict]:
+        """
+        Validate the sentiment column and the article count
+        
+        Args:
+            df (pd.DataFrame): DataFrame with sentiment analysis
+            sentiment_column (str): Column containing sentiment labels
+            
+        Returns:
+            dict: INSUFFICIENT_DATA signal if there are too few articles, else None
+        """
         if sentiment_column not in df.columns:
             raise ValueError(f"Column '{sentiment_column}' not found in DataFrame")
         
@@ -49,19 +108,67 @@ class TradingSignalGenerator:
                 'reason': f'Insufficient articles. Need at least {self.min_articles}, got {len(df)}',
                 'details': {}
             }
+        return None
+    
+    def _tally(self, df: pd.DataFrame, sentiment_column: str,
+               confidence_column: Optional[str] = None,
+               codes: Optional[np.ndarray] = None,
+               counts: Optional[pd.Series] = None) -> Tuple[Tuple, Optional[Tuple]]:
+        """
+        Count labels and, optionally, sum confidence per label in a single pass
         
-        # Count sentiment distribution
-        sentiment_counts = df[sentiment_column].value_counts()
-        positive_count = sentiment_counts.get('positive', 0)
-        negative_count = sentiment_counts.get('negative', 0)
-        neutral_count = sentiment_counts.get('neutral', 0)
-        total_count = len(df)
-        
-        # Calculate percentages
-        positive_pct = (positive_count / total_count) * 100
-        negative_pct = (negative_count / total_count) * 100
+        Args:
+            df (pd.DataFrame): DataFrame with sentiment analysis
+            sentiment_column (str): Column containing sentiment labels
+            confidence_column (str): Column containing confidence scores (None for counts only)
+            codes (np.ndarray): Already encoded sentiment codes, to skip re-encoding
+            counts (pd.Series): Precomputed value_counts() of the labels, to skip counting
+            
+        Returns:
+            tuple: ((positive, negative, neutral) counts, (positive, negative, neutral) weights or None)
+        """
+        if counts is not None:
+            counts = _label_counts(counts)
+            if confidence_column is None:
+                return counts, None
+        
+        if codes is None:
+            codes = _sentiment_codes(df[sentiment_column])
+        
+        if confidence_column is None:
+            return _count_labels(codes), None
+        
+        if counts is not None:
+            return counts, _weighted_label_sums(codes, _finite_weights(df[confidence_column]))
+        
+        tallies = _label_tallies(codes, _finite_weights(df[confidence_column]))
+        return tallies[:3], tallies[3:]
+    
+    def _signal_from_counts(self, counts: Tuple, total_count: int, sentiment_column: str) -> Dict:
+        """
+        Apply the basic signal rules to precomputed label counts
+        
+        Args:
+            counts (tuple): (positive, negative, neutral) article counts
+            total_count (int): Total number of articles
+            sentiment_column (str): Column the labels came from
+            
+        Returns:
+            dict: Trading signal with detailed analysis
+        """
+        positive_count, negative_count, neutral_count = counts
+        
+        # Calculate shares, percentages and ratios once for all branches
+        positive_share = positive_count / total_count
+        negative_share = negative_count / total_count
+        positive_pct = positive_share * 100
+        negative_pct = negative_share * 100
         neutral_pct = (neutral_count / total_count) * 100
         
+        # Equal to the plain ratios whenever both counts are non-zero, which is the only branch that uses them
+        positive_ratio = positive_count / max(negative_count, 1)
+        negative_ratio = negative_count / max(positive_count, 1)
+        
         # Generate signal based on basic logic
         signal = 'HOLD'
         reason = ''
@@ -71,19 +178,16 @@ class TradingSignalGenerator:
             # No negative articles, some positive
             signal = 'BUY'
             reason = f'No negative sentiment detected, {positive_count} positive articles'
-            confidence = min(0.9, 0.7 + (positive_count / total_count) * 0.2)
+            confidence = min(0.9, 0.7 + positive_share * 0.2)
             
         elif positive_count == 0 and negative_count > 0:
             # No positive articles, some negative
             signal = 'SELL'
             reason = f'No positive sentiment detected, {negative_count} negative articles'
-            confidence = min(0.9, 0.7 + (negative_count / total_count) * 0.2)
+            confidence = min(0.9, 0.7 + negative_share * 0.2)
             
         elif positive_count > 0 and negative_count > 0:
             # Both positive and negative articles exist
-            positive_ratio = positive_count / negative_count
-            negative_ratio = negative_count / positive_count
-            
             if positive_ratio >= self.positive_threshold:
                 signal = 'BUY'
                 reason = f'Positive articles ({positive_count}) are {positive_ratio:.1f}x more than negative ({negative_count})'
@@ -114,8 +218,8 @@ class TradingSignalGenerator:
             'positive_percentage': positive_pct,
             'negative_percentage': negative_pct,
             'neutral_percentage': neutral_pct,
-            'positive_to_negative_ratio': positive_count / max(negative_count, 1),
-            'negative_to_positive_ratio': negative_count / max(positive_count, 1),
+            'positive_to_negative_ratio': positive_ratio,
+            'negative_to_positive_ratio': negative_ratio,
             'sentiment_column_used': sentiment_column
         }
         
@@ -129,7 +233,8 @@ class TradingSignalGenerator:
     
     def generate_weighted_signal(self, df: pd.DataFrame, 
                                 sentiment_column: str = 'combined_sentiment_label',
-                                confidence_column: str = 'combined_sentiment_confidence') -> Dict:
+                                confidence_column: str = 'combined_sentiment_confidence',
+                                precomputed_counts: Optional[pd.Series] = None) -> Dict:
         """
         Generate trading signal considering confidence scores
         
@@ -137,27 +242,42 @@ class TradingSignalGenerator:
             df (pd.DataFrame): DataFrame with sentiment analysis
             sentiment_column (str): Column containing sentiment labels
             confidence_column (str): Column containing confidence scores
+            precomputed_counts (pd.Series): value_counts() of sentiment_column, if the caller already has it
+            
+        Returns:
+            dict: Enhanced trading signal with confidence weighting
+        """
+        return self._weighted_signal(df, sentiment_column, confidence_column, counts=precomputed_counts)
+    
+    def _weighted_signal(self, df: pd.DataFrame, sentiment_column: str, confidence_column: str,
+                         codes: Optional[np.ndarray] = None,
+                         counts: Optional[pd.Series] = None) -> Dict:
+        """
+        Weighted signal from one fused pass over the labels (see generate_weighted_signal)
+        
+        Args:
+            df (pd.DataFrame): DataFrame with sentiment analysis
+            sentiment_column (str): Column containing sentiment labels
+            confidence_column (str): Column containing confidence scores
+            codes (np.ndarray): Already encoded sentiment codes, to skip re-encoding
+            counts (pd.Series): Precomputed value_counts() of the labels, to skip counting
             
         Returns:
             dict: Enhanced trading signal with confidence weighting
         """
         if confidence_column not in df.columns:
             # Fall back to basic signal if no confidence column
-            return self.generate_basic_signal(df, sentiment_column)
-        
-        # Get basic signal first
-        basic_signal = self.generate_basic_signal(df, sentiment_column)
-        
-        if basic_signal['signal'] == 'INSUFFICIENT_DATA':
-            return basic_signal
+            return self.generate_basic_signal(df, sentiment_column, counts)
         
-        # Calculate weighted sentiment scores
-        df_copy = df.copy()
+        insufficient = self._check_articles(df, sentiment_column)
+        if insufficient is not None:
+            return insufficient
         
-        # Calculate weighted sentiment contribution
-        positive_weight = df_copy[df_copy[sentiment_column] == 'positive'][confidence_column].sum()
-        negative_weight = df_copy[df_copy[sentiment_column] == 'negative'][confidence_column].sum()
-        neutral_weight = df_copy[df_copy[sentiment_column] == 'neutral'][confidence_column].sum()
+        # Count articles and sum confidence per label together, then get the basic signal from the counts
+        counts, (positive_weight, negative_weight, neutral_weight) = self._tally(
+            df, sentiment_column, confidence_column, codes, counts
+        )
+        basic_signal = self._signal_from_counts(counts, len(df), sentiment_column)
         
         total_weight = positive_weight + negative_weight + neutral_weight
         
@@ -187,8 +307,8 @@ class TradingSignalGenerator:
                 reason = f'Weighted analysis: {weighted_negative_pct:.1f}% negative vs {weighted_positive_pct:.1f}% positive'
             confidence = min(0.95, confidence + self.confidence_weight * 0.2)
         
-        # Update details with weighted information
-        enhanced_details = basic_signal['details'].copy()
+        # Update details with weighted information (basic_signal is discarded, so extend its details in place)
+        enhanced_details = basic_signal['details']
         enhanced_details.update({
             'weighted_positive_percentage': weighted_positive_pct,
             'weighted_negative_percentage': weighted_negative_pct,
@@ -205,32 +325,32 @@ class TradingSignalGenerator:
             'timestamp': datetime.now().isoformat()
         }
     
-    def _normalize_datetime_columns(self, df: pd.DataFrame, date_column: str) -> pd.DataFrame:
+    def _normalize_datetime(self, series: pd.Series) -> pd.Series:
         """
-        Helper method to normalize datetime columns and handle timezone issues
+        Helper method to normalize a datetime series and handle timezone issues
         
         Args:
-            df (pd.DataFrame): DataFrame with datetime column
-            date_column (str): Name of the datetime column
+            series (pd.Series): Series of dates (datetime64 or parseable values)
             
         Returns:
-            pd.DataFrame: DataFrame with normalized datetime column
+            pd.Series: Timezone-naive UTC datetime series
         """
-        df_copy = df.copy()
-        
-        # Ensure the column is datetime
-        df_copy[date_column] = pd.to_datetime(df_copy[date_column])
+        # Only parse when the column isn't datetime already
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            series = pd.to_datetime(series)
         
         # Convert to timezone-naive UTC if timezone-aware
-        if df_copy[date_column].dt.tz is not None:
-            df_copy[date_column] = df_copy[date_column].dt.tz_convert('UTC').dt.tz_localize(None)
+        if series.dt.tz is not None:
+            series = series.dt.tz_convert('UTC').dt.tz_localize(None)
         
-        return df_copy
+        return series
     
     def generate_time_weighted_signal(self, df: pd.DataFrame, 
                                      sentiment_column: str = 'combined_sentiment_label',
                                      date_column: str = 'published_at',
-                                     recent_days: int = 7) -> Dict:
+                                     recent_days: int = 7,
+                                     precomputed_counts: Optional[pd.Series] = None,
+                                     precomputed_dates: Optional[pd.Series] = None) -> Dict:
         """
         Generate trading signal with more weight given to recent articles
         
@@ -239,47 +359,51 @@ class TradingSignalGenerator:
             sentiment_column (str): Column containing sentiment labels
             date_column (str): Column containing publication dates
             recent_days (int): Number of recent days to give more weight
+            precomputed_counts (pd.Series): value_counts() of sentiment_column, if the caller already has it
+            precomputed_dates (pd.Series): Already parsed date_column, if the caller already has it
             
         Returns:
             dict: Time-weighted trading signal
         """
-        if date_column not in df.columns:
-            return self.generate_weighted_signal(df, sentiment_column)
+        if date_column not in df.columns and precomputed_dates is None:
+            return self.generate_weighted_signal(df, sentiment_column, precomputed_counts=precomputed_counts)
         
         try:
             # Normalize datetime columns to avoid timezone issues
-            df_copy = self._normalize_datetime_columns(df, date_column)
+            raw_dates = precomputed_dates if precomputed_dates is not None else df[date_column]
+            dates = self._normalize_datetime(raw_dates).to_numpy(dtype='datetime64[ns]')
             
-            # Use timezone-naive current time
-            current_time = pd.Timestamp.now().replace(tzinfo=None)
-            
-            # Calculate recency weights
-            df_copy['days_ago'] = (current_time - df_copy[date_column]).dt.days
+            # Calculate recency weights as whole days against the current UTC time (NaN for missing dates)
+            days_ago = np.floor((np.datetime64('now', 'ns') - dates) / np.timedelta64(1, 'D'))
             
             # Handle negative days (future dates) by setting them to 0
-            df_copy['days_ago'] = df_copy['days_ago'].clip(lower=0)
+            days_ago = np.clip(days_ago, 0, None)
             
         except Exception as e:
             print(f"Warning: Could not calculate time weights due to datetime issues: {e}")
             print("Falling back to weighted signal analysis...")
-            return self.generate_weighted_signal(df, sentiment_column)
+            return self.generate_weighted_signal(df, sentiment_column, precomputed_counts=precomputed_counts)
         
         # Recent articles get higher weight
-        df_copy['time_weight'] = np.where(
-            df_copy['days_ago'] <= recent_days,
+        is_recent = days_ago <= recent_days
+        time_weight = np.where(
+            is_recent,
             2.0,  # Double weight for recent articles
             1.0   # Normal weight for older articles
         )
         
         # Calculate time-weighted sentiment counts
-        time_weighted_positive = df_copy[df_copy[sentiment_column] == 'positive']['time_weight'].sum()
-        time_weighted_negative = df_copy[df_copy[sentiment_column] == 'negative']['time_weight'].sum()
-        time_weighted_neutral = df_copy[df_copy[sentiment_column] == 'neutral']['time_weight'].sum()
+        codes = _sentiment_codes(df[sentiment_column])
+        time_weighted_positive, time_weighted_negative, time_weighted_neutral = _weighted_label_sums(
+            codes,
+            time_weight
+        )
         
         total_time_weight = time_weighted_positive + time_weighted_negative + time_weighted_neutral
         
-        # Get base signal
-        base_signal = self.generate_weighted_signal(df, sentiment_column)
+        # Get base signal, reusing the encoded labels
+        base_signal = self._weighted_signal(df, sentiment_column, 'combined_sentiment_confidence', codes,
+                                            precomputed_counts)
         
         if total_time_weight == 0:
             return base_signal
@@ -303,13 +427,13 @@ class TradingSignalGenerator:
             reason = f'Time-weighted analysis favors SELL: {time_negative_pct:.1f}% negative (recent articles weighted 2x)'
             confidence = min(0.95, confidence + 0.1)
         
-        # Enhanced details
-        enhanced_details = base_signal['details'].copy()
+        # Enhanced details (base_signal is discarded, so extend its details in place)
+        enhanced_details = base_signal['details']
         enhanced_details.update({
             'time_weighted_positive_percentage': time_positive_pct,
             'time_weighted_negative_percentage': time_negative_pct,
             'recent_days_threshold': recent_days,
-            'articles_in_recent_period': len(df_copy[df_copy['days_ago'] <= recent_days])
+            'articles_in_recent_period': int(np.count_nonzero(is_recent))
         })
         
         return {
@@ -342,27 +466,53 @@ class TradingSignalGenerator:
             'INSUFFICIENT_DATA': '⚪ ❓'
         }
         
-        summary = f"\n{'='*60}\n"
-        summary += f"🚦 TRADING SIGNAL ANALYSIS\n"
-        summary += f"{'='*60}\n"
-        summary += f"Signal: {emoji_map.get(signal, '❓')} {signal}\n"
-        summary += f"Confidence: {confidence:.1%}\n"
-        summary += f"Reason: {reason}\n"
-        summary += f"\n📊 SENTIMENT BREAKDOWN:\n"
-        summary += f"Total Articles: {details.get('total_articles', 0)}\n"
-        summary += f"Positive: {details.get('positive_count', 0)} ({details.get('positive_percentage', 0):.1f}%)\n"
-        summary += f"Negative: {details.get('negative_count', 0)} ({details.get('negative_percentage', 0):.1f}%)\n"
-        summary += f"Neutral: {details.get('neutral_count', 0)} ({details.get('neutral_percentage', 0):.1f}%)\n"
+        parts = [
+            '',
+            SUMMARY_SEPARATOR,
+            "🚦 TRADING SIGNAL ANALYSIS",
+            SUMMARY_SEPARATOR,
+            f"Signal: {emoji_map.get(signal, '❓')} {signal}",
+            f"Confidence: {confidence:.1%}",
+            f"Reason: {reason}",
+            '',
+            "📊 SENTIMENT BREAKDOWN:",
+            f"Total Articles: {details.get('total_articles', 0)}",
+            f"Positive: {details.get('positive_count', 0)} ({details.get('positive_percentage', 0):.1f}%)",
+            f"Negative: {details.get('negative_count', 0)} ({details.get('negative_percentage', 0):.1f}%)",
+            f"Neutral: {details.get('neutral_count', 0)} ({details.get('neutral_percentage', 0):.1f}%)"
+        ]
         
         if 'positive_to_negative_ratio' in details:
-            summary += f"\n📈 RATIOS:\n"
-            summary += f"Positive/Negative Ratio: {details['positive_to_negative_ratio']:.2f}\n"
-            summary += f"Negative/Positive Ratio: {details['negative_to_positive_ratio']:.2f}\n"
-        
-        summary += f"\n⏰ Generated: {signal_result['timestamp']}\n"
-        summary += f"{'='*60}\n"
-        
-        return summary
+            parts.extend([
+                '',
+                "📈 RATIOS:",
+                f"Positive/Negative Ratio: {details['positive_to_negative_ratio']:.2f}",
+                f"Negative/Positive Ratio: {details['negative_to_positive_ratio']:.2f}"
+            ])
+        
+        parts.extend([
+            '',
+            f"⏰ Generated: {signal_result['timestamp']}",
+            SUMMARY_SEPARATOR,
+            ''
+        ])
+        
+        return "\n".join(parts)
+
+@functools.lru_cache(maxsize=16)
+def _get_generator(positive_threshold: float = 2.0,
+                   negative_threshold: float = 2.0,
+                   min_articles: int = 5,
+                   confidence_weight: float = 0.3) -> TradingSignalGenerator:
+    """Return a shared generator for the given settings (generators hold no per-call state)"""
+    return TradingSignalGenerator(positive_threshold, negative_threshold, min_articles, confidence_weight)
+
+# Signal methods by name, resolved once at import
+_METHODS = {
+    'basic': TradingSignalGenerator.generate_basic_signal,
+    'weighted': TradingSignalGenerator.generate_weighted_signal,
+    'time_weighted': TradingSignalGenerator.generate_time_weighted_signal
+}
 
 # Convenience function for quick signal generation
 def generate_trading_signal(df: pd.DataFrame, 
@@ -379,13 +529,7 @@ def generate_trading_signal(df: pd.DataFrame,
     Returns:
         dict: Trading signal result
     """
-    generator = TradingSignalGenerator()
+    if method not in _METHODS:
+        raise ValueError(f"Unknown method: {method}. Use 'basic', 'weighted', or 'time_weighted'")
     
-    if method == 'basic':
-        return generator.generate_basic_signal(df, sentiment_column)
-    elif method == 'weighted':
-        return generator.generate_weighted_signal(df, sentiment_column)
-    elif method == 'time_weighted':
-        return generator.generate_time_weighted_signal(df, sentiment_column)
-    else:
-        raise ValueError(f"Unknown method: {method}. Use 'basic', 'weighted', or 'time_weighted'")
\ No newline at end of file
+    return _METHODS[method](_get_generator(), df, sentiment_column)
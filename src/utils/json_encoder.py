@@ -3,21 +3,44 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, date
 
+def _isoformat(obj):
+    return obj.isoformat()
+
 class NumpyJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle numpy and pandas types"""
     
+    # Exact-type converters for the common cases; subclasses and other types fall through to default()'s checks
+    _DISPATCH = {
+        np.int64: int,
+        np.int32: int,
+        np.int16: int,
+        np.int8: int,
+        np.float64: float,
+        np.float32: float,
+        np.float16: float,
+        np.bool_: bool,
+        np.ndarray: np.ndarray.tolist,
+        datetime: _isoformat,
+        date: _isoformat,
+        pd.Timestamp: _isoformat,
+    }
+    
     def default(self, obj):
-        if isinstance(obj, (np.integer, np.int64, np.int32, np.int16, np.int8)):
+        converter = self._DISPATCH.get(type(obj))
+        if converter is not None:
+            return converter(obj)
+        
+        if isinstance(obj, np.integer):
             return int(obj)
-        elif isinstance(obj, (np.floating, np.float64, np.float32, np.float16)):
+        elif isinstance(obj, np.floating):
             return float(obj)
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
         elif isinstance(obj, (datetime, date)):
             return obj.isoformat()
-        elif pd.isna(obj):
+        elif pd.api.types.is_scalar(obj) and pd.isna(obj):
             return None
         elif hasattr(obj, 'item'):  # Handle scalar numpy types
             return obj.item()
         
-        return super().default(obj)
\ No newline at end of file
+        return super().default(obj)
@@ -1,33 +1,155 @@
+import os
+import matplotlib
+# Charts are written to files by default, so start on Agg and skip GUI backend setup (unless
+# MPLBACKEND picks one); interactive visualizers switch to a GUI backend when they are created
+if 'MPLBACKEND' not in os.environ:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import pandas as pd
 import numpy as np
 import seaborn as sns
-from typing import Dict, List, Optional
-import os
+from typing import Dict, List, Optional, Union
+import io
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+plt.rcParams['path.simplify'] = True
+
+# GUI backends tried, in order, when charts have to be shown in a window
+GUI_BACKENDS = ['MacOSX', 'QtAgg', 'TkAgg', 'GTK4Agg', 'GTK3Agg', 'WXAgg']
+
+# Display order of the bar charts
+SENTIMENT_ORDER = ['positive', 'neutral', 'negative']
+
+# Sentiment labels in plotting order; any other label is ignored by the timeline
+SENTIMENT_DTYPE = pd.CategoricalDtype(['positive', 'negative', 'neutral'])
+
+def parse_dates(df: pd.DataFrame, col: str = 'published_at') -> pd.Series:
+    """
+    Return a date column as UTC datetime64, without modifying the DataFrame
+    
+    A column that is already datetime64 is returned as is, so callers that parse
+    once up front (like the web app's analysis cache) skip the work on every chart.
+    Repeated timestamps are parsed only once.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with the date column
+        col (str): Name of the date column
+        
+    Returns:
+        pd.Series: Parsed dates
+    """
+    if pd.api.types.is_datetime64_any_dtype(df[col]):
+        return df[col]
+    return pd.to_datetime(df[col], cache=True, utc=True)
+
+def _render_png_bytes(fig) -> bytes:
+    """
+    Render a figure straight to PNG bytes, for serving charts without a temp file
+    
+    Args:
+        fig (matplotlib.figure.Figure): Figure to render
+        
+    Returns:
+        bytes: PNG image data
+    """
+    buffer = io.BytesIO()
+    # Empty metadata skips the software stamp; fast compression as for saved charts
+    fig.canvas.print_png(buffer, metadata={}, pil_kwargs={'compress_level': 1})
+    return buffer.getvalue()
+
+def _new_figure(figsize, interactive: bool = False, **subplot_kw):
+    """
+    Create a figure and its axes
+    
+    Only figures that will be shown go through pyplot. The others are plain Agg
+    figures outside pyplot's global figure registry, so server threads rendering
+    charts never touch shared pyplot state, and the figures are freed with their
+    last reference.
+    
+    Args:
+        figsize (tuple): Figure size in inches
+        interactive (bool): Create the figure through pyplot so plt.show() can display it
+        **subplot_kw: Passed to Figure.subplots (e.g. nrows, ncols)
+        
+    Returns:
+        tuple: (figure, axes)
+    """
+    if interactive:
+        fig = plt.figure(figsize=figsize)
+    else:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+    return fig, fig.subplots(**subplot_kw)
+
+def _close_figure(fig):
+    """Release a figure from pyplot; figures created outside pyplot need nothing"""
+    if fig.canvas.manager is not None:
+        plt.close(fig)
+
+def _use_gui_backend() -> bool:
+    """
+    Switch pyplot from Agg to the first GUI backend that can be loaded
+    
+    Returns:
+        bool: True if charts can be shown in a window
+    """
+    if plt.get_backend().lower() != 'agg':
+        return True
+    
+    for backend in GUI_BACKENDS:
+        try:
+            plt.switch_backend(backend)
+            return True
+        except (ImportError, RuntimeError):
+            continue
+    
+    logger.warning("⚠️ No GUI backend available; charts are saved but not shown")
+    return False
 
 class SentimentVisualizer:
     """
     A class to create visualizations for sentiment analysis results
     """
     
-    def __init__(self, style='seaborn-v0_8', figsize=(10, 6)):
+    # Absolute chart directories already created by this process
+    _created_dirs = set()
+    
+    def __init__(self, style='seaborn-v0_8', figsize=(10, 6), interactive=False):
         """
         Initialize the visualizer
         
         Args:
             style (str): Matplotlib style
             figsize (tuple): Default figure size
+            interactive (bool): Also show charts in a window after saving (keep False on servers)
         """
         plt.style.use('default')  # Use default style as seaborn styles may not be available
         self.figsize = figsize
+        # Showing needs a GUI backend; without one the charts are only saved
+        self.interactive = interactive and _use_gui_backend()
         self.colors = {
             'positive': '#2E8B57',  # Sea Green
             'negative': '#DC143C',  # Crimson
             'neutral': '#4682B4'    # Steel Blue
         }
+        # Colors in the positive/neutral/negative order used by the bar charts
+        self._ordered_colors = [self.colors[sentiment] for sentiment in SENTIMENT_ORDER]
+        
+        # Bar chart figure, created on first use and reused by every later bar chart;
+        # the lock keeps concurrent requests from drawing on it at the same time
+        self._bar_fig = None
+        self._bar_ax = None
+        self._bar_backend = None
+        self._bar_lock = threading.Lock()
     
     def create_sentiment_bar_chart(self, df: pd.DataFrame, sentiment_column: str = 'title_sentiment_label', 
-                                  title: str = None, save_path: str = None) -> str:
+                                  title: str = None, save_path: str = None, interactive: Optional[bool] = None,
+                                  return_bytes: bool = False) -> Union[str, bytes]:
         """
         Create a bar chart showing sentiment distribution
         
@@ -36,9 +158,11 @@ class SentimentVisualizer:
             sentiment_column (str): Column containing sentiment labels
             title (str): Chart title
             save_path (str): Path to save the chart
+            interactive (bool): Also show the chart in a window (default: self.interactive)
+            return_bytes (bool): Return the PNG bytes instead of saving to a file
             
         Returns:
-            str: Path where the chart was saved
+            str or bytes: Path where the chart was saved, or the PNG bytes if return_bytes
         """
         if sentiment_column not in df.columns:
             raise ValueError(f"Column '{sentiment_column}' not found in DataFrame")
@@ -52,18 +176,56 @@ class SentimentVisualizer:
                 sentiment_counts[sentiment] = 0
         
         # Reorder for consistent display
-        sentiment_counts = sentiment_counts.reindex(['positive', 'neutral', 'negative'])
+        sentiment_counts = sentiment_counts.reindex(SENTIMENT_ORDER)
         
         # Calculate percentages
         total_articles = len(df)
         sentiment_percentages = (sentiment_counts / total_articles * 100).round(1)
         
-        # Create the plot
-        fig, ax = plt.subplots(figsize=self.figsize)
+        if interactive is None:
+            interactive = self.interactive
+        elif interactive:
+            interactive = _use_gui_backend()
+        
+        with self._bar_lock:
+            return self._draw_bar_chart(sentiment_counts, sentiment_percentages,
+                                        title, save_path, interactive, return_bytes)
+    
+    def _draw_bar_chart(self, sentiment_counts: pd.Series, sentiment_percentages: pd.Series,
+                        title: str, save_path: str, interactive: bool,
+                        return_bytes: bool = False) -> Union[str, bytes]:
+        """
+        Draw and save the bar chart on the reused figure (caller holds self._bar_lock)
+        
+        Args:
+            sentiment_counts (pd.Series): Article count per sentiment
+            sentiment_percentages (pd.Series): Percentage per sentiment
+            title (str): Chart title
+            save_path (str): Path to save the chart
+            interactive (bool): Also show the chart in a window
+            return_bytes (bool): Return the PNG bytes instead of saving to a file
+            
+        Returns:
+            str or bytes: Path where the chart was saved, or the PNG bytes if return_bytes
+        """
+        # For display the figure must come from pyplot under the current backend; recreate it if
+        # it was built for files only, under another backend, or its window was closed
+        if self._bar_fig is not None and interactive and (self._bar_backend != plt.get_backend()
+                                                          or not plt.fignum_exists(self._bar_fig.number)):
+            _close_figure(self._bar_fig)
+            self._bar_fig = None
+        
+        if self._bar_fig is None:
+            self._bar_fig, self._bar_ax = _new_figure(self.figsize, interactive)
+            self._bar_backend = plt.get_backend() if interactive else None
+        
+        # Reuse the shared figure
+        fig, ax = self._bar_fig, self._bar_ax
+        ax.clear()
         
         # Create bars
         bars = ax.bar(sentiment_counts.index, sentiment_counts.values, 
-                     color=[self.colors[sentiment] for sentiment in sentiment_counts.index],
+                     color=self._ordered_colors,
                      alpha=0.8, edgecolor='black', linewidth=1)
         
         # Customize the chart
@@ -74,11 +236,9 @@ class SentimentVisualizer:
         ax.set_ylabel('Number of Articles', fontsize=12, fontweight='bold')
         
         # Add value labels on bars
-        for i, (bar, count, percentage) in enumerate(zip(bars, sentiment_counts.values, sentiment_percentages.values)):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + total_articles * 0.01,
-                   f'{count}\n({percentage}%)', 
-                   ha='center', va='bottom', fontweight='bold', fontsize=11)
+        labels = [f'{count}\n({percentage}%)'
+                  for count, percentage in zip(sentiment_counts.values, sentiment_percentages.values)]
+        ax.bar_label(bars, labels=labels, padding=3, fontweight='bold', fontsize=11)
         
         # Customize appearance
         ax.grid(axis='y', alpha=0.3, linestyle='--')
@@ -88,12 +248,18 @@ class SentimentVisualizer:
         ax.set_ylim(0, max(sentiment_counts.values) * 1.15)
         
         # Capitalize x-axis labels
-        ax.set_xticklabels([label.capitalize() for label in sentiment_counts.index])
+        ax.set_xticks(range(len(sentiment_counts)), [label.capitalize() for label in sentiment_counts.index])
         
         # Add a subtle background
         ax.set_facecolor('#f8f9fa')
         
-        plt.tight_layout()
+        fig.tight_layout()
+        
+        # Web callers get the PNG bytes directly instead of a file
+        if return_bytes:
+            png_bytes = _render_png_bytes(fig)
+            ax.clear()
+            return png_bytes
         
         # Save the chart - FIX: Ensure directory exists
         if save_path is None:
@@ -102,26 +268,31 @@ class SentimentVisualizer:
             # Ensure the directory exists for the provided save_path
             save_dir = os.path.dirname(save_path)
             if save_dir:  # Only create if there's a directory component
-                os.makedirs(save_dir, exist_ok=True)
+                self._ensure_directory(save_dir)
+        
+        fig.savefig(save_path, dpi=100, facecolor='white', pil_kwargs={'compress_level': 1})
+        logger.info("📊 Chart saved to: %s", save_path)
         
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
-        print(f"📊 Chart saved to: {save_path}")
+        if interactive:
+            plt.show()
         
-        # Show the plot (optional)
-        plt.show()
+        # Clear for the next chart
+        ax.clear()
         
         return save_path
     
-    def create_comprehensive_sentiment_chart(self, df: pd.DataFrame, save_path: str = None) -> str:
+    def create_comprehensive_sentiment_chart(self, df: pd.DataFrame, save_path: str = None,
+                                             return_bytes: bool = False) -> Union[str, bytes]:
         """
         Create a comprehensive chart showing sentiment for title, description, and combined
         
         Args:
             df (pd.DataFrame): DataFrame with comprehensive sentiment analysis
             save_path (str): Path to save the chart
+            return_bytes (bool): Return the PNG bytes instead of saving to a file
             
         Returns:
-            str: Path where the chart was saved
+            str or bytes: Path where the chart was saved, or the PNG bytes if return_bytes
         """
         # Check if comprehensive analysis columns exist
         analysis_types = []
@@ -135,29 +306,24 @@ class SentimentVisualizer:
         if not analysis_types:
             raise ValueError("No sentiment analysis columns found in DataFrame")
         
-        # Prepare data for plotting
-        sentiment_data = []
-        for analysis_type in analysis_types:
-            col_name = f'{analysis_type}_sentiment_label'
-            counts = df[col_name].value_counts()
-            
-            for sentiment in ['positive', 'neutral', 'negative']:
-                sentiment_data.append({
-                    'analysis_type': analysis_type.capitalize(),
-                    'sentiment': sentiment.capitalize(),
-                    'count': counts.get(sentiment, 0),
-                    'percentage': (counts.get(sentiment, 0) / len(df)) * 100
-                })
+        # Counts as a (analysis types, sentiments) array in SENTIMENT_ORDER
+        counts = np.stack([
+            df[f'{analysis_type}_sentiment_label'].value_counts().reindex(SENTIMENT_ORDER).fillna(0).to_numpy(dtype=float)
+            for analysis_type in analysis_types
+        ])
+        percentages = counts / len(df) * 100
         
-        sentiment_df = pd.DataFrame(sentiment_data)
+        type_labels = [analysis_type.capitalize() for analysis_type in analysis_types]
+        indexes = np.arange(len(analysis_types))
+        width = 0.5 / len(SENTIMENT_ORDER)
         
         # Create the plot
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        fig, (ax1, ax2) = _new_figure((15, 6), self.interactive, nrows=1, ncols=2)
         
         # Plot 1: Grouped bar chart (counts)
-        pivot_counts = sentiment_df.pivot(index='analysis_type', columns='sentiment', values='count')
-        pivot_counts.plot(kind='bar', ax=ax1, color=[self.colors[s.lower()] for s in pivot_counts.columns],
-                         alpha=0.8, edgecolor='black', linewidth=1)
+        for j, sentiment in enumerate(SENTIMENT_ORDER):
+            ax1.bar(indexes + (j - 1) * width, counts[:, j], width, label=sentiment.capitalize(),
+                    color=self._ordered_colors[j], alpha=0.8, edgecolor='black', linewidth=1)
         
         ax1.set_title('Sentiment Distribution by Analysis Type\n(Article Counts)', 
                      fontsize=14, fontweight='bold')
@@ -165,13 +331,14 @@ class SentimentVisualizer:
         ax1.set_ylabel('Number of Articles', fontsize=12, fontweight='bold')
         ax1.legend(title='Sentiment', title_fontsize=11, fontsize=10)
         ax1.grid(axis='y', alpha=0.3, linestyle='--')
-        ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45)
+        ax1.set_xticks(indexes, type_labels, rotation=45)
         
         # Plot 2: Stacked percentage bar chart
-        pivot_pct = sentiment_df.pivot(index='analysis_type', columns='sentiment', values='percentage')
-        pivot_pct.plot(kind='bar', stacked=True, ax=ax2, 
-                      color=[self.colors[s.lower()] for s in pivot_pct.columns],
-                      alpha=0.8, edgecolor='black', linewidth=1)
+        bottom = np.zeros(len(analysis_types))
+        for j, sentiment in enumerate(SENTIMENT_ORDER):
+            ax2.bar(indexes, percentages[:, j], 0.5, bottom=bottom, label=sentiment.capitalize(),
+                    color=self._ordered_colors[j], alpha=0.8, edgecolor='black', linewidth=1)
+            bottom += percentages[:, j]
         
         ax2.set_title('Sentiment Distribution by Analysis Type\n(Percentages)', 
                      fontsize=14, fontweight='bold')
@@ -179,23 +346,32 @@ class SentimentVisualizer:
         ax2.set_ylabel('Percentage (%)', fontsize=12, fontweight='bold')
         ax2.legend(title='Sentiment', title_fontsize=11, fontsize=10)
         ax2.set_ylim(0, 100)
-        ax2.set_xticklabels(ax2.get_xticklabels(), rotation=45)
+        ax2.set_xticks(indexes, type_labels, rotation=45)
+        
+        fig.tight_layout()
         
-        plt.tight_layout()
+        # Web callers get the PNG bytes directly instead of a file
+        if return_bytes:
+            png_bytes = _render_png_bytes(fig)
+            _close_figure(fig)
+            return png_bytes
         
         # Save the chart
         if save_path is None:
             save_path = self._generate_save_path('comprehensive_sentiment_analysis.png')
         
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
-        print(f"📊 Comprehensive chart saved to: {save_path}")
+        fig.savefig(save_path, dpi=100, facecolor='white', pil_kwargs={'compress_level': 1})
+        logger.info("📊 Comprehensive chart saved to: %s", save_path)
         
-        plt.show()
+        if self.interactive:
+            plt.show()
+        
+        _close_figure(fig)
         
         return save_path
     
     def create_sentiment_timeline(self, df: pd.DataFrame, sentiment_column: str = 'title_sentiment_label',
-                                 save_path: str = None) -> str:
+                                 save_path: str = None, return_bytes: bool = False) -> Union[str, bytes]:
         """
         Create a timeline chart showing sentiment over time
         
@@ -203,9 +379,10 @@ class SentimentVisualizer:
             df (pd.DataFrame): DataFrame with sentiment analysis and date columns
             sentiment_column (str): Column containing sentiment labels
             save_path (str): Path to save the chart
+            return_bytes (bool): Return the PNG bytes instead of saving to a file
             
         Returns:
-            str: Path where the chart was saved
+            str or bytes: Path where the chart was saved, or the PNG bytes if return_bytes
         """
         if 'published_at' not in df.columns:
             raise ValueError("'published_at' column not found in DataFrame")
@@ -213,22 +390,22 @@ class SentimentVisualizer:
         if sentiment_column not in df.columns:
             raise ValueError(f"Column '{sentiment_column}' not found in DataFrame")
         
-        # Prepare data
-        df_copy = df.copy()
-        df_copy['date'] = pd.to_datetime(df_copy['published_at']).dt.date
+        # Prepare data: day bins stay datetime64 and labels become categorical codes
+        dates = parse_dates(df).dt.floor('D')
+        sentiments = pd.Categorical.from_codes(SENTIMENT_DTYPE.categories.get_indexer(df[sentiment_column]),
+                                               dtype=SENTIMENT_DTYPE)
         
-        # Group by date and sentiment
-        daily_sentiment = df_copy.groupby(['date', sentiment_column]).size().unstack(fill_value=0)
+        # Count articles per day and sentiment (only sentiments that occur become columns)
+        daily_sentiment = pd.crosstab(dates, sentiments)
         
         # Create the plot
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = _new_figure((12, 6), self.interactive)
         
         # Plot lines for each sentiment
-        for sentiment in ['positive', 'negative', 'neutral']:
-            if sentiment in daily_sentiment.columns:
-                ax.plot(daily_sentiment.index, daily_sentiment[sentiment], 
-                       marker='o', linewidth=2, label=sentiment.capitalize(),
-                       color=self.colors[sentiment], alpha=0.8)
+        for sentiment in daily_sentiment.columns:
+            ax.plot(daily_sentiment.index, daily_sentiment[sentiment], 
+                   marker='o', linewidth=2, label=sentiment.capitalize(),
+                   color=self.colors[sentiment], alpha=0.8, rasterized=True)
         
         ax.set_title('Sentiment Trends Over Time', fontsize=16, fontweight='bold', pad=20)
         ax.set_xlabel('Date', fontsize=12, fontweight='bold')
@@ -237,18 +414,27 @@ class SentimentVisualizer:
         ax.grid(True, alpha=0.3, linestyle='--')
         
         # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
-        plt.tight_layout()
+        fig.tight_layout()
+        
+        # Web callers get the PNG bytes directly instead of a file
+        if return_bytes:
+            png_bytes = _render_png_bytes(fig)
+            _close_figure(fig)
+            return png_bytes
         
         # Save the chart
         if save_path is None:
             save_path = self._generate_save_path('sentiment_timeline.png')
         
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
-        print(f"📊 Timeline chart saved to: {save_path}")
+        fig.savefig(save_path, dpi=100, facecolor='white', pil_kwargs={'compress_level': 1})
+        logger.info("📊 Timeline chart saved to: %s", save_path)
+        
+        if self.interactive:
+            plt.show()
         
-        plt.show()
+        _close_figure(fig)
         
         return save_path
     
@@ -264,9 +450,22 @@ class SentimentVisualizer:
         """
         # Create charts directory if it doesn't exist
         charts_dir = os.path.join('data', 'charts')
-        os.makedirs(charts_dir, exist_ok=True)
+        self._ensure_directory(charts_dir)
         
         return os.path.join(charts_dir, filename)
+    
+    @classmethod
+    def _ensure_directory(cls, directory: str):
+        """
+        Create a directory once per process; later saves to it skip the mkdir syscalls
+        
+        Args:
+            directory (str): Directory path (relative paths are resolved against the current directory)
+        """
+        directory = os.path.abspath(directory)
+        if directory not in cls._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            cls._created_dirs.add(directory)
 
 def create_simple_sentiment_chart(csv_filepath: str, sentiment_column: str = 'title_sentiment_label'):
     """
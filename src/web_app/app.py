@@ -1,6 +1,8 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 import sys
 import os
+import logging
+import shutil
 
 # Add the parent directory to the path so we can import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -8,41 +10,152 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from data_fetcher.news_api import NewsAPIFetcher
 from sentiment_analysis.analyzer import SentimentAnalyzer
 from trading_logic.signal_generator import TradingSignalGenerator
+from visualization.sentiment_charts import SentimentVisualizer, parse_dates
 import pandas as pd
 from dotenv import load_dotenv
-import traceback
 from datetime import datetime
 import json
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 
 # Load environment variables
 load_dotenv()
 
+# Status lines go through logging so they are formatted lazily and can be silenced with the level;
+# the runner configures the handlers (__main__ below, or gunicorn_conf.py under gunicorn)
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 
+# orjson serializes numpy scalars from the pandas summaries natively in C
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+# (result, sentiment frame) per (company, max_articles, days_back); news changes slowly, so reuse
+# them for 15 minutes. Charts read the frame under the same key, so they always match the JSON result
+analysis_cache = TTLCache(maxsize=32, ttl=900)
+analysis_cache_lock = threading.Lock()
+
+# Shared pool for the three independent signal calls, reused across requests
+signal_executor = ThreadPoolExecutor(max_workers=3)
+
 class TradingAnalysisService:
     """Service class to handle the complete trading analysis pipeline"""
     
-    def __init__(self):
+    def __init__(self, preload=True):
         self.news_fetcher = None
         self.sentiment_analyzer = None
         self.signal_generator = None
         self.company_name = os.getenv('COMPANY_NAME', 'Reliance Industries')
+        self._init_lock = threading.Lock()
+        
+        # Load everything once at startup so requests don't pay the model cold start;
+        # anything that fails here (e.g. a missing API key) is retried on the first request
+        if preload:
+            self.preload()
     
-    def run_complete_analysis(self):
-        """Run the complete analysis pipeline and return results"""
+    def preload(self):
+        """Initialize the components now, deferring any failure to the first request"""
         try:
-            # Step 1: Initialize components
-            print("Initializing components...")
-            self.news_fetcher = NewsAPIFetcher()
-            self.sentiment_analyzer = SentimentAnalyzer()
-            self.signal_generator = TradingSignalGenerator()
+            self._initialize_components()
+        except Exception as e:
+            logger.warning("⚠️ Component initialization deferred to first request: %s", e)
+    
+    def _initialize_components(self):
+        """Create any missing component once and warm up the sentiment model"""
+        with self._init_lock:
+            if self.signal_generator is None:
+                self.signal_generator = TradingSignalGenerator()
+            
+            if self.sentiment_analyzer is None:
+                logger.info("Initializing components...")
+                sentiment_analyzer = SentimentAnalyzer()
+                # Warm up the model so the first real request doesn't pay allocation costs
+                sentiment_analyzer.warm_up()
+                self.sentiment_analyzer = sentiment_analyzer
+            
+            if self.news_fetcher is None:
+                self.news_fetcher = NewsAPIFetcher()
+    
+    def run_complete_analysis(self, company_name=None, max_articles=30, days_back=30, force=False):
+        """
+        Run the complete analysis pipeline, reusing a recent result for the same inputs
+        
+        Args:
+            company_name (str): Company to analyze (defaults to the configured company)
+            max_articles (int): Maximum number of articles to analyze
+            days_back (int): Number of days to look back for news
+            force (bool): Drop any cached result and run the analysis again
+            
+        Returns:
+            dict: Analysis result
+        """
+        result, _ = self.get_analysis(company_name, max_articles, days_back, force)
+        return result
+    
+    def get_analysis(self, company_name=None, max_articles=30, days_back=30, force=False):
+        """
+        Return the analysis result together with the sentiment frame it was computed from
+        
+        Args:
+            company_name (str): Company to analyze (defaults to the configured company)
+            max_articles (int): Maximum number of articles to analyze
+            days_back (int): Number of days to look back for news
+            force (bool): Drop any cached result and run the analysis again
+            
+        Returns:
+            tuple: (analysis result dict, sentiment DataFrame or None if the analysis failed)
+        """
+        company_name = company_name or self.company_name
+        cache_key = (company_name, max_articles, days_back)
+        with analysis_cache_lock:
+            if force:
+                analysis_cache.pop(cache_key, None)
+            else:
+                cached = analysis_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+        
+        analysis = self._run_analysis(company_name, max_articles, days_back)
+        
+        # Only successful analyses are cached so failures are retried
+        if analysis[0]['success']:
+            with analysis_cache_lock:
+                analysis_cache[cache_key] = analysis
+        
+        return analysis
+    
+    def get_cached_frame(self, company_name=None, max_articles=30, days_back=30):
+        """
+        Return the sentiment frame of a cached analysis without running a new one
+        
+        Args:
+            company_name (str): Company that was analyzed (defaults to the configured company)
+            max_articles (int): Maximum number of articles of the analysis
+            days_back (int): Number of days the analysis looked back
+            
+        Returns:
+            pd.DataFrame or None: Sentiment frame, or None if no such analysis is cached
+        """
+        cache_key = (company_name or self.company_name, max_articles, days_back)
+        with analysis_cache_lock:
+            cached = analysis_cache.get(cache_key)
+        return cached[1] if cached is not None else None
+    
+    def _run_analysis(self, company_name, max_articles, days_back):
+        """Run the complete analysis pipeline and return (result, sentiment frame)"""
+        try:
+            # Step 1: Initialize components (normally already done at startup)
+            if self.news_fetcher is None or self.sentiment_analyzer is None:
+                self._initialize_components()
             
             # Step 2: Fetch news data
-            print(f"Fetching news for {self.company_name}...")
+            logger.info("Fetching news for %s...", company_name)
             df = self.news_fetcher.fetch_company_news(
-                company_name=self.company_name,
-                max_articles=30,
-                days_back=30
+                company_name=company_name,
+                max_articles=max_articles,
+                days_back=days_back
             )
             
             if df.empty:
@@ -51,17 +164,35 @@ class TradingAnalysisService:
                     'error': 'No news articles found for the specified company',
                     'signal': 'NO_DATA',
                     'confidence': 0.0
-                }
+                }, None
             
             # Step 3: Sentiment Analysis
-            print("Analyzing sentiment...")
-            df_with_sentiment = self.sentiment_analyzer.analyze_dataframe_comprehensive(df)
+            logger.info("Analyzing sentiment...")
+            df_with_sentiment = self.sentiment_analyzer.analyze_dataframe_comprehensive(df, copy=False)
+            # Parse publication dates once, before the frame is cached and shared by the signals and
+            # charts; unparseable dates are left as they are for the signal generator's own fallback
+            if 'published_at' in df_with_sentiment.columns:
+                try:
+                    df_with_sentiment['published_at'] = parse_dates(df_with_sentiment)
+                except (ValueError, TypeError) as e:
+                    logger.warning("⚠️ Could not parse publication dates: %s", e)
             
             # Step 4: Generate Trading Signals
-            print("Generating trading signals...")
-            basic_signal = self.signal_generator.generate_basic_signal(df_with_sentiment, 'combined_sentiment_label')
-            weighted_signal = self.signal_generator.generate_weighted_signal(df_with_sentiment, 'combined_sentiment_label')
-            time_weighted_signal = self.signal_generator.generate_time_weighted_signal(df_with_sentiment, 'combined_sentiment_label')
+            logger.info("Generating trading signals...")
+            # Count labels once for all three signal methods (dates are already parsed)
+            label_counts = df_with_sentiment['combined_sentiment_label'].value_counts()
+            published_dates = df_with_sentiment['published_at'] if 'published_at' in df_with_sentiment.columns else None
+            # The three signal methods only read df_with_sentiment, so run them concurrently
+            basic_future = signal_executor.submit(self.signal_generator.generate_basic_signal, df_with_sentiment,
+                                                  'combined_sentiment_label', precomputed_counts=label_counts)
+            weighted_future = signal_executor.submit(self.signal_generator.generate_weighted_signal, df_with_sentiment,
+                                                     'combined_sentiment_label', precomputed_counts=label_counts)
+            time_weighted_future = signal_executor.submit(self.signal_generator.generate_time_weighted_signal, df_with_sentiment,
+                                                          'combined_sentiment_label', precomputed_counts=label_counts,
+                                                          precomputed_dates=published_dates)
+            basic_signal = basic_future.result()
+            weighted_signal = weighted_future.result()
+            time_weighted_signal = time_weighted_future.result()
             
             # Determine consensus signal
             signals = [basic_signal['signal'], weighted_signal['signal'], time_weighted_signal['signal']]
@@ -84,7 +215,7 @@ class TradingAnalysisService:
                 'success': True,
                 'signal': consensus,
                 'confidence': round(avg_confidence, 3),
-                'company': self.company_name,
+                'company': company_name,
                 'analysis_timestamp': datetime.now().isoformat(),
                 'total_articles': len(df_with_sentiment),
                 'sentiment_breakdown': {
@@ -106,22 +237,22 @@ class TradingAnalysisService:
                 'reasoning': weighted_signal.get('reason', 'Signal generated based on sentiment analysis')
             }
             
-            return result
+            return result, df_with_sentiment
             
         except Exception as e:
             error_msg = f"Error during analysis: {str(e)}"
-            print(error_msg)
-            traceback.print_exc()
+            logger.exception(error_msg)
             
             return {
                 'success': False,
                 'error': error_msg,
                 'signal': 'ERROR',
                 'confidence': 0.0
-            }
+            }, None
 
 # Initialize the service
-analysis_service = TradingAnalysisService()
+# Run as a script, this process only hands over to gunicorn (or preloads before app.run below)
+analysis_service = TradingAnalysisService(preload=__name__ != '__main__')
 
 @app.route('/')
 def index():
@@ -132,8 +263,8 @@ def index():
 def analyze():
     """Run the complete analysis and return results"""
     try:
-        result = analysis_service.run_complete_analysis()
-        return jsonify(result)
+        result = analysis_service.run_complete_analysis(force=request.args.get('force') == '1')
+        return app.response_class(orjson.dumps(result, option=ORJSON_OPTIONS), mimetype='application/json')
     except Exception as e:
         return jsonify({
             'success': False,
@@ -142,18 +273,70 @@ def analyze():
             'confidence': 0.0
         }), 500
 
+# Chart renderers by URL kind; each returns PNG bytes for a company's sentiment frame
+chart_visualizer = SentimentVisualizer()
+CHART_RENDERERS = {
+    'distribution': lambda df, company_name: chart_visualizer.create_sentiment_bar_chart(
+        df, 'combined_sentiment_label', title=f'Sentiment Distribution - {company_name}', return_bytes=True),
+    'comprehensive': lambda df, company_name: chart_visualizer.create_comprehensive_sentiment_chart(df, return_bytes=True),
+    'timeline': lambda df, company_name: chart_visualizer.create_sentiment_timeline(df, 'combined_sentiment_label', return_bytes=True)
+}
+
+@app.route('/chart/<kind>')
+def chart(kind):
+    """
+    Render a chart straight to PNG bytes for a cached analysis, identified by the query string
+    (company, max_articles, days_back; the defaults match /analyze). Charts never start an analysis
+    """
+    if kind not in CHART_RENDERERS:
+        return jsonify({'success': False, 'error': f"Unknown chart '{kind}'. Use one of: {', '.join(CHART_RENDERERS)}"}), 404
+    
+    try:
+        company_name = request.args.get('company') or analysis_service.company_name
+        df_with_sentiment = analysis_service.get_cached_frame(
+            company_name,
+            max_articles=request.args.get('max_articles', 30, type=int),
+            days_back=request.args.get('days_back', 30, type=int)
+        )
+        if df_with_sentiment is None:
+            return jsonify({'success': False, 'error': 'No analysis available for these parameters. Run /analyze first'}), 404
+        
+        png_bytes = CHART_RENDERERS[kind](df_with_sentiment, company_name)
+        return Response(png_bytes, mimetype='image/png')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()])
+    
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
     os.makedirs('static', exist_ok=True)
     
-    print("🚀 Starting Trading Signal Web App...")
-    print(f"📊 Company: {analysis_service.company_name}")
-    print("🌐 Open http://localhost:5001 in your browser")
+    logger.info("🚀 Starting Trading Signal Web App...")
+    logger.info("📊 Company: %s", analysis_service.company_name)
+    logger.info("🌐 Open http://localhost:5001 in your browser")
+    
+    # Serve with gunicorn when available: --preload builds the service (and its model) once in
+    # the master, the forked workers share the weights copy-on-write, and threads add concurrency
+    gunicorn = shutil.which('gunicorn')
+    if gunicorn and not sys.platform.startswith('win'):
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        workers = 2
+        # Split the cores between the workers so their torch thread pools don't oversubscribe the CPU
+        os.environ.setdefault('OMP_NUM_THREADS', str(max(1, (os.cpu_count() or 1) // workers)))
+        os.execvp(gunicorn, [
+            "gunicorn", "--config", os.path.join(src_dir, 'web_app', 'gunicorn_conf.py'),
+            "--workers", str(workers), "--threads", "4", "--preload",
+            "--timeout", "300",  # a cold analysis can take a couple of minutes
+            "--chdir", src_dir, "--bind", "0.0.0.0:5001", "web_app.app:app"
+        ])
     
-    app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
+    # Development fallback: no reloader, so the model is loaded only once
+    analysis_service.preload()
+    app.run(debug=False, host='0.0.0.0', port=5001, threaded=True)
@@ -0,0 +1,8 @@
+"""
+Gunicorn settings for the web apps, loaded by `python web_app/app.py` and run_web_app.py
+"""
+import logging
+
+# Gunicorn reads this file before it preloads the app, so the app's status lines
+# (which it logs instead of printing) are shown from startup on
+logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler()])
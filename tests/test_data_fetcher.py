@@ -1,4 +1,6 @@
 import unittest
+from unittest import mock
+import requests
 from src.data_fetcher.news_api import NewsAPIFetcher
 import pandas as pd
 
@@ -16,5 +18,77 @@ class TestNewsAPIFetcher(unittest.TestCase):
         self.assertIn('description', articles_df.columns)
         self.assertIn('publishedAt', articles_df.columns)
 
+def _page(page, count, total_results=300):
+    """Build a fake NewsAPI response with `count` articles for the given page"""
+    return {
+        'status': 'ok',
+        'totalResults': total_results,
+        'articles': [
+            {
+                'title': f'Article {page}-{i}',
+                'description': f'Description {page}-{i}',
+                'source': {'name': 'Test Source'},
+                'publishedAt': f'2024-01-{page:02d}T{i % 24:02d}:00:00Z',
+            }
+            for i in range(count)
+        ],
+    }
+
+class TestNewsAPIPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.fetcher = NewsAPIFetcher(api_key='test-key')
+
+    def _fetch(self, responses):
+        def fake_fetch_page(params):
+            response = responses[params['page']]
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        with mock.patch.object(self.fetcher, '_fetch_page', side_effect=fake_fetch_page):
+            return self.fetcher.fetch_company_news('Test Co', max_articles=300, clean_data=False)
+
+    def test_all_pages_fetched_in_order(self):
+        df = self._fetch({1: _page(1, 100), 2: _page(2, 100), 3: _page(3, 100)})
+        self.assertEqual(len(df), 300)
+        self.assertEqual(df['title'].str.startswith('Article 3-').sum(), 100)
+
+    def test_later_page_failure_keeps_earlier_pages(self):
+        df = self._fetch({1: _page(1, 100), 2: requests.exceptions.HTTPError('426 Upgrade Required'),
+                          3: _page(3, 100)})
+        self.assertEqual(len(df), 100)
+        self.assertTrue(df['title'].str.startswith('Article 1-').all())
+
+    def test_failure_after_good_pages_keeps_them(self):
+        df = self._fetch({1: _page(1, 100), 2: _page(2, 100),
+                          3: requests.exceptions.HTTPError('426 Upgrade Required')})
+        self.assertEqual(len(df), 200)
+        self.assertFalse(df['title'].str.startswith('Article 3-').any())
+
+class TestNewsAPICleanData(unittest.TestCase):
+
+    def setUp(self):
+        self.fetcher = NewsAPIFetcher(api_key='test-key')
+
+    def test_unparseable_date_keeps_date_columns(self):
+        df = pd.DataFrame({
+            'title': ['Test Co beats estimates', 'Test Co expands', 'Test Co hires'],
+            'description': ['Strong quarter', 'New plant', 'New CEO'],
+            'published_at': ['2024-01-02T10:00:00Z', '', '2024-01-03T15:30:00Z'],
+            'company_searched': ['Test Co'] * 3,
+        })
+
+        cleaned = self.fetcher.clean_data(df)
+
+        self.assertEqual(len(cleaned), 3)
+        for column in ['date', 'year', 'month', 'day', 'hour']:
+            self.assertIn(column, cleaned.columns)
+        by_title = cleaned.set_index('title')
+        self.assertEqual(by_title.loc['Test Co beats estimates', 'year'], 2024)
+        self.assertEqual(by_title.loc['Test Co hires', 'hour'], 15)
+        self.assertTrue(pd.isna(by_title.loc['Test Co expands', 'year']))
+        self.assertTrue(pd.isna(by_title.loc['Test Co expands', 'hour']))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from src.trading_logic import _loops
+from src.trading_logic import signal_generator
+from src.trading_logic.signal_generator import TradingSignalGenerator
+
+def _sentiment_frame():
+    """Mixed labels (including one the generator ignores) with some missing confidences"""
+    now = pd.Timestamp.now(tz='UTC')
+    days_ago = [0, 1, 2, 3, 5, 6, 8, 9, 10, 12, 15, 20]
+    return pd.DataFrame({
+        'combined_sentiment_label': ['positive', 'negative', 'neutral', 'positive', 'mixed', 'negative',
+                                     'positive', 'neutral', 'positive', 'negative', 'neutral', 'positive'],
+        'combined_sentiment_confidence': [0.9, 0.3, 0.6, 0.85, 0.5, np.nan, 0.95, np.nan, 0.8, 0.2, 0.4, np.nan],
+        'published_at': [(now - pd.Timedelta(days=days, hours=1)).isoformat() for days in days_ago]
+    })
+
+class TestTradingSignalGenerator(unittest.TestCase):
+    """Expected values are the results of the original pandas implementation on the same frame"""
+
+    def setUp(self):
+        self.generator = TradingSignalGenerator()
+        self.df = _sentiment_frame()
+
+    def assert_counts(self, details):
+        self.assertEqual(details['total_articles'], 12)
+        self.assertEqual((details['positive_count'], details['negative_count'], details['neutral_count']), (5, 3, 3))
+        self.assertAlmostEqual(details['positive_percentage'], 41.66666666666667)
+        self.assertAlmostEqual(details['positive_to_negative_ratio'], 1.6666666666666667)
+        self.assertAlmostEqual(details['negative_to_positive_ratio'], 0.6)
+
+    def assert_weighted(self, details):
+        self.assertAlmostEqual(details['total_confidence_weight'], 5.0)
+        self.assertAlmostEqual(details['weighted_positive_percentage'], 70.0)
+        self.assertAlmostEqual(details['weighted_negative_percentage'], 10.0)
+        self.assertAlmostEqual(details['weighted_neutral_percentage'], 20.0)
+
+    def check_signals(self):
+        basic = self.generator.generate_basic_signal(self.df)
+        self.assertEqual(basic['signal'], 'HOLD')
+        self.assertAlmostEqual(basic['confidence'], 0.433)
+        self.assertEqual(basic['reason'], 'Sentiment is mixed - positive: 5, negative: 3 (ratio: 1.7)')
+        self.assert_counts(basic['details'])
+
+        weighted = self.generator.generate_weighted_signal(self.df)
+        self.assertEqual(weighted['signal'], 'BUY')
+        self.assertAlmostEqual(weighted['confidence'], 0.493)
+        self.assertEqual(weighted['reason'], 'Weighted analysis: 70.0% positive vs 10.0% negative')
+        self.assert_counts(weighted['details'])
+        self.assert_weighted(weighted['details'])
+
+        time_weighted = self.generator.generate_time_weighted_signal(self.df)
+        self.assertEqual(time_weighted['signal'], 'BUY')
+        self.assertAlmostEqual(time_weighted['confidence'], 0.493)
+        self.assert_counts(time_weighted['details'])
+        self.assert_weighted(time_weighted['details'])
+        self.assertEqual(time_weighted['details']['articles_in_recent_period'], 6)
+        self.assertAlmostEqual(time_weighted['details']['time_weighted_positive_percentage'], 43.75)
+        self.assertAlmostEqual(time_weighted['details']['time_weighted_negative_percentage'], 31.25)
+
+    def test_signals_match_original_implementation(self):
+        self.check_signals()
+
+    def test_signals_match_without_numba(self):
+        with mock.patch.multiple(signal_generator,
+                                 _count_labels=_loops._count_labels_vectorized,
+                                 _label_tallies=_loops._label_tallies_vectorized,
+                                 _weighted_label_sums=_loops._weighted_label_sums_vectorized):
+            self.check_signals()
+
+    def test_too_few_articles(self):
+        signal = self.generator.generate_basic_signal(self.df.head(3))
+        self.assertEqual(signal['signal'], 'INSUFFICIENT_DATA')
+
+if __name__ == '__main__':
+    unittest.main()